@@ -4,8 +4,10 @@ Category Classifier
 Classifies trends and keywords into product categories.
 """
 
+import functools
 import logging
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Set
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,69 @@ class CategoryClassifier:
     def __init__(self, config: Config):
         self.config = config
         self.categories = self.config.get_categories()
+        self._build_matcher()
+        
+        # Classification is deterministic per keyword, so memoize it per instance
+        self._classify_keyword_cached = functools.lru_cache(maxsize=4096)(self._classify_keyword)
+    
+    def _build_matcher(self):
+        """Compile all category keywords into a single multi-pattern matcher."""
+        self._category_order = {category: i for i, category in enumerate(self.categories)}
+        self._keyword_counts = {category: len(keywords) for category, keywords in self.categories.items()}
+        self._categories_lc = {
+            category: [keyword.lower() for keyword in keywords]
+            for category, keywords in self.categories.items()
+        }
+        
+        # Categories owning each lowercased keyword
+        keyword_categories: Dict[str, Set[str]] = {}
+        for category, keywords in self._categories_lc.items():
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, set()).add(category)
+        
+        # A match only reports the longest keyword starting at a position, so
+        # credit every keyword contained in it as well.
+        self._keyword_closure: Dict[str, Set[str]] = {
+            keyword: {other for other in keyword_categories if other in keyword}
+            for keyword in keyword_categories
+        }
+        self._keyword_categories = keyword_categories
+        
+        # Zero-width lookahead finds overlapping matches at every position
+        alternatives = sorted((k for k in keyword_categories if k), key=len, reverse=True)
+        if alternatives:
+            self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, alternatives)) + '))')
+        else:
+            self._pattern = None
+        
+        # Exact-match index so keywords that are themselves category terms
+        # resolve with a single dict lookup instead of a scan
+        self._keyword_index: Dict[str, str] = {
+            keyword: self._best_category(self._keyword_closure[keyword])
+            for keyword in keyword_categories
+        }
+    
+    def _find_keywords(self, text_lower: str) -> Set[str]:
+        """Return every category keyword contained in the lowercased text."""
+        found = set()
+        if self._pattern is None:
+            return found
+        
+        for match in self._pattern.finditer(text_lower):
+            found.update(self._keyword_closure[match.group(1)])
+        
+        return found
+    
+    def _best_category(self, keywords: Set[str]) -> Optional[str]:
+        """Pick the earliest configured category owning any of the keywords."""
+        matched_categories = set()
+        for category_keyword in keywords:
+            matched_categories.update(self._keyword_categories[category_keyword])
+        
+        if not matched_categories:
+            return None
+        
+        return min(matched_categories, key=self._category_order.__getitem__)
     
     def classify_keyword(self, keyword: str) -> Optional[str]:
         """
@@ -27,14 +92,18 @@ class CategoryClassifier:
         Returns:
             Category name or None if no match
         """
+        return self._classify_keyword_cached(keyword)
+    
+    def _classify_keyword(self, keyword: str) -> Optional[str]:
+        """Classify a keyword without memoization."""
         keyword_lower = keyword.lower()
         
-        for category, keywords in self.categories.items():
-            for category_keyword in keywords:
-                if category_keyword.lower() in keyword_lower:
-                    return category
+        category = self._keyword_index.get(keyword_lower)
+        if category is not None:
+            return category
         
-        return None
+        # Earliest configured category wins, as with a sequential scan
+        return self._best_category(self._find_keywords(keyword_lower))
     
     def get_category_keywords(self, category: str) -> List[str]:
         """Get keywords for a specific category."""
@@ -54,16 +123,19 @@ class CategoryClassifier:
         Returns:
             Dictionary mapping categories to confidence scores
         """
-        text_lower = text.lower()
+        found = self._find_keywords(text.lower())
         category_scores = {}
         
-        for category, keywords in self.categories.items():
+        if not found:
+            return category_scores
+        
+        for category, keywords in self._categories_lc.items():
             score = 0
             for keyword in keywords:
-                if keyword.lower() in text_lower:
+                if keyword in found:
                     score += 1
             
             if score > 0:
-                category_scores[category] = score / len(keywords)
+                category_scores[category] = score / self._keyword_counts[category]
         
         return category_scores 
\ No newline at end of file
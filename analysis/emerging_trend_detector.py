@@ -9,12 +9,21 @@ across multiple time periods and data sources.
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterator, List, Tuple, Optional, Any
+import heapq
+import itertools
 import logging
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Extra product tags suggested for trends in these categories
+_CATEGORY_TAGS: Dict[str, Tuple[str, ...]] = {
+    'jewelry': ('necklace', 'bracelet', 'ring', 'earrings'),
+    'home_decor': ('wall art', 'home decor', 'interior design'),
+    'gifts': ('gift', 'present', 'special occasion')
+}
+
 class EmergingTrendDetector:
     """Detects emerging trends using delta analysis and multi-source validation."""
     
@@ -54,196 +63,257 @@ class EmergingTrendDetector:
         Returns:
             Emerging score (0-1 scale)
         """
-        if previous_popularity <= 0:
-            # Handle new trends
-            if current_popularity > 0:
-                return min(0.8, current_popularity / 100)  # Cap at 0.8 for new trends
-            else:
-                return 0.0
-                
-        # Calculate growth rate
-        growth_rate = (current_popularity - previous_popularity) / (previous_popularity + 1)
+        scores = self._emerging_scores_vec(
+            np.array([current_popularity], dtype=np.float64),
+            np.array([previous_popularity], dtype=np.float64)
+        )
         
-        # Apply logarithmic scaling
-        log_factor = np.log(current_popularity + 1)
+        return float(scores[0])
         
-        # Calculate emerging score
-        emerging_score = growth_rate * log_factor
+    def _emerging_scores_vec(self, current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+        """
+        Calculate emerging scores for paired popularity arrays in one pass.
         
-        # Normalize to 0-1 range and apply minimum threshold
-        emerging_score = max(0, min(1, emerging_score))
+        Args:
+            current: Current popularity scores
+            previous: Previous popularity scores
+            
+        Returns:
+            Array of emerging scores (0-1 scale)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Growth rate with logarithmic scaling, normalized to 0-1 range
+            growth_rate = (current - previous) / (previous + 1)
+            emerging_scores = np.clip(growth_rate * np.log1p(current), 0.0, 1.0)
+            
+        # Handle new trends (capped at 0.8)
+        new_trend_scores = np.where(current > 0, np.minimum(0.8, current / 100), 0.0)
         
-        return emerging_score
+        return np.where(previous <= 0, new_trend_scores, emerging_scores)
         
     def detect_emerging_trends(self, 
                               trends_data: List[Dict[str, Any]],
-                              historical_data: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+                              historical_data: Optional[List[Dict[str, Any]]] = None,
+                              top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Detect emerging trends from current and historical data.
         
         Args:
             trends_data: Current trends data
             historical_data: Historical trends data for comparison
+            top_k: Only return the top K trends by emerging score (all if None)
             
         Returns:
             List of emerging trends with scores
         """
+        emerging_trends = self._iter_emerging_trends(trends_data, historical_data)
+        
+        # Sort by emerging score
+        if top_k is not None:
+            return heapq.nlargest(top_k, emerging_trends, key=lambda x: x.get('emerging_score', 0))
+            
+        return sorted(emerging_trends, key=lambda x: x.get('emerging_score', 0), reverse=True)
+        
+    def _iter_emerging_trends(self, 
+                              trends_data: List[Dict[str, Any]],
+                              historical_data: Optional[List[Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield emerging trends, in input order, as they are scored.
+        
+        Args:
+            trends_data: Current trends data
+            historical_data: Historical trends data for comparison
+            
+        Yields:
+            Emerging trends with scores
+        """
         if not trends_data:
-            return []
+            return
             
         # Group trends by keyword and platform
         current_trends = defaultdict(dict)
+        keyword_platforms = defaultdict(set)
         for trend in trends_data:
             key = (trend['keyword'], trend['platform'])
             current_trends[key] = trend
+            keyword_platforms[trend['keyword']].add(trend['platform'])
             
-        # Group historical data
-        historical_trends = defaultdict(dict)
+        # Previous popularity per keyword and platform; only the score is
+        # needed, so the historical records themselves are not retained
+        historical_popularity = {}
         if historical_data:
             for trend in historical_data:
                 key = (trend['keyword'], trend['platform'])
-                historical_trends[key] = trend
+                historical_popularity[key] = trend.get('popularity_score', 0)
                 
-        emerging_trends = []
+        # Calculate emerging scores and growth rates for all trends with
+        # history in one pass
+        matched_keys = [key for key in current_trends if key in historical_popularity]
+        current_scores = np.fromiter(
+            (current_trends[key].get('popularity_score', 0) for key in matched_keys),
+            dtype=np.float64, count=len(matched_keys)
+        )
+        previous_scores = np.fromiter(
+            (historical_popularity[key] for key in matched_keys),
+            dtype=np.float64, count=len(matched_keys)
+        )
+        emerging_scores = self._emerging_scores_vec(current_scores, previous_scores)
+        growth_rates = (current_scores - previous_scores) / np.maximum(previous_scores, 1)
+        matched = dict(zip(matched_keys, zip(emerging_scores.tolist(), growth_rates.tolist())))
         
         for (keyword, platform), current_trend in current_trends.items():
             # Find corresponding historical data
-            historical_trend = historical_trends.get((keyword, platform))
+            scores = matched.get((keyword, platform))
             
-            if historical_trend:
-                # Calculate emerging score
-                emerging_score = self.calculate_emerging_score(
-                    current_trend.get('popularity_score', 0),
-                    historical_trend.get('popularity_score', 0)
-                )
+            if scores is not None:
+                emerging_score, growth_rate = scores
                 
                 # Check if trend is emerging
                 if emerging_score >= self.min_emerging_score:
                     current_trend['emerging_score'] = emerging_score
-                    current_trend['growth_rate'] = (
-                        current_trend.get('popularity_score', 0) - 
-                        historical_trend.get('popularity_score', 0)
-                    ) / max(historical_trend.get('popularity_score', 1), 1)
+                    current_trend['growth_rate'] = growth_rate
+                    current_trend['is_new'] = False
                     
-                    emerging_trends.append(current_trend)
+                    yield current_trend
             else:
                 # New trend - check if it appears in multiple sources
-                if self._is_new_trend_emerging(keyword, current_trends):
+                if len(keyword_platforms[keyword]) >= self.min_sources:
                     current_trend['emerging_score'] = 0.7  # Default score for new trends
-                    current_trend['growth_rate'] = float('inf')  # Infinite growth for new trends
-                    emerging_trends.append(current_trend)
+                    current_trend['growth_rate'] = np.nan  # No baseline to grow from
+                    current_trend['is_new'] = True
+                    yield current_trend
                     
-        # Sort by emerging score
-        emerging_trends.sort(key=lambda x: x.get('emerging_score', 0), reverse=True)
-        
-        return emerging_trends
-        
-    def _is_new_trend_emerging(self, keyword: str, current_trends: Dict) -> bool:
-        """
-        Check if a new trend is emerging across multiple sources.
-        
-        Args:
-            keyword: Trend keyword
-            current_trends: Current trends data
-            
-        Returns:
-            True if trend appears in multiple sources
-        """
-        sources = set()
-        for (k, platform) in current_trends.keys():
-            if k == keyword:
-                sources.add(platform)
-                
-        return len(sources) >= self.min_sources
-        
     def calculate_multi_source_confidence(self, 
-                                       trends_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                                       trends_data: List[Dict[str, Any]],
+                                       trend_frame: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Calculate confidence scores based on multi-source appearance.
         
         Args:
             trends_data: List of trend dictionaries
+            trend_frame: Frame from build_trend_frame(trends_data), built here if None
             
         Returns:
             List of trends with updated confidence scores
         """
-        # Group by keyword
-        keyword_sources = defaultdict(set)
-        keyword_trends = defaultdict(list)
-        
-        for trend in trends_data:
-            keyword = trend['keyword']
-            platform = trend['platform']
-            keyword_sources[keyword].add(platform)
-            keyword_trends[keyword].append(trend)
-            
-        # Calculate confidence scores
-        for keyword, trends in keyword_trends.items():
-            source_count = len(keyword_sources[keyword])
-            
-            # Base confidence on number of sources
-            base_confidence = min(1.0, source_count / 4.0)  # Max 4 sources
-            
-            # Boost confidence for high emerging scores
-            max_emerging = max(t.get('emerging_score', 0) for t in trends)
-            emerging_boost = max_emerging * 0.3
+        if not trends_data:
+            return trends_data
             
-            # Boost confidence for high popularity
-            max_popularity = max(t.get('popularity_score', 0) for t in trends)
-            popularity_boost = min(0.2, max_popularity / 100)
+        frame = self.build_trend_frame(trends_data) if trend_frame is None else trend_frame
+        grouped = frame.groupby('keyword', sort=False, observed=True)
+        
+        # Broadcast per-keyword aggregates back onto every trend row
+        source_count = grouped['platform'].transform('nunique').to_numpy()
+        max_emerging = grouped['emerging_score'].transform('max').to_numpy()
+        max_popularity = grouped['popularity_score'].transform('max').to_numpy()
+        
+        # Base confidence on number of sources (max 4), boosted for high
+        # emerging scores and high popularity
+        base_confidence = np.minimum(1.0, source_count / 4.0)
+        emerging_boost = max_emerging * 0.3
+        popularity_boost = np.minimum(0.2, max_popularity / 100)
+        final_confidence = np.minimum(1.0, base_confidence + emerging_boost + popularity_boost)
+        
+        # Distinct platforms per keyword, in order of first appearance
+        keyword_sources = defaultdict(list)
+        pairs = frame[['keyword', 'platform']].drop_duplicates()
+        for keyword, platform in zip(pairs['keyword'], pairs['platform']):
+            keyword_sources[keyword].append(platform)
             
-            final_confidence = min(1.0, base_confidence + emerging_boost + popularity_boost)
+        # Update all trends with their keyword's scores
+        for trend, confidence, count in zip(trends_data, final_confidence.tolist(), source_count.tolist()):
+            trend['confidence_score'] = confidence
+            trend['source_count'] = count
+            trend['sources'] = list(keyword_sources[trend['keyword']])
             
-            # Update all trends for this keyword
-            for trend in trends:
-                trend['confidence_score'] = final_confidence
-                trend['source_count'] = source_count
-                trend['sources'] = list(keyword_sources[keyword])
-                
         return trends_data
         
+    def build_trend_frame(self, trends_data: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert trend dictionaries into a columnar frame.
+        
+        The frame can be built once and passed to both
+        calculate_multi_source_confidence and detect_cross_platform_trends,
+        as long as keywords, platforms and scores are not changed in between.
+        
+        Args:
+            trends_data: List of trend dictionaries
+            
+        Returns:
+            DataFrame with one row per trend, in input order
+        """
+        count = len(trends_data)
+        
+        return pd.DataFrame({
+            'keyword': pd.Categorical([t['keyword'] for t in trends_data]),
+            'platform': pd.Categorical([t['platform'] for t in trends_data]),
+            'popularity_score': np.fromiter(
+                (t.get('popularity_score', 0) for t in trends_data), dtype=np.float64, count=count
+            ),
+            'emerging_score': np.fromiter(
+                (t.get('emerging_score', 0) for t in trends_data), dtype=np.float64, count=count
+            )
+        })
+        
     def detect_cross_platform_trends(self, 
                                    trends_data: List[Dict[str, Any]],
-                                   min_sources: int = 2) -> List[Dict[str, Any]]:
+                                   min_sources: int = 2,
+                                   top_k: Optional[int] = None,
+                                   trend_frame: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Detect trends that appear across multiple platforms.
         
         Args:
             trends_data: List of trend dictionaries
             min_sources: Minimum number of sources required
+            top_k: Only return the top K trends by confidence (all if None)
+            trend_frame: Frame from build_trend_frame(trends_data), built here if None
             
         Returns:
             List of cross-platform trends
         """
-        # Group by keyword
-        keyword_data = defaultdict(list)
-        for trend in trends_data:
-            keyword_data[trend['keyword']].append(trend)
-            
+        frame = self.build_trend_frame(trends_data) if trend_frame is None else trend_frame
+        grouped = frame.groupby('keyword', sort=False, observed=True)
+        
+        # Calculate aggregate metrics for every keyword at once
+        keyword_stats = grouped.agg(
+            source_count=('platform', 'size'),
+            avg_popularity=('popularity_score', 'mean'),
+            avg_emerging=('emerging_score', 'mean'),
+            max_emerging=('emerging_score', 'max')
+        )
+        keyword_stats = keyword_stats[keyword_stats['source_count'] >= min_sources]
+        keyword_stats['confidence_score'] = np.minimum(
+            1.0, keyword_stats['source_count'] / 4.0 + keyword_stats['max_emerging'] * 0.3
+        )
+        
+        positions = grouped.indices
         cross_platform_trends = []
         
-        for keyword, trends in keyword_data.items():
-            if len(trends) >= min_sources:
-                # Calculate aggregate metrics
-                avg_popularity = np.mean([t.get('popularity_score', 0) for t in trends])
-                avg_emerging = np.mean([t.get('emerging_score', 0) for t in trends])
-                max_emerging = max([t.get('emerging_score', 0) for t in trends])
-                
-                # Create aggregated trend
-                aggregated_trend = {
-                    'keyword': keyword,
-                    'platforms': [t['platform'] for t in trends],
-                    'source_count': len(trends),
-                    'avg_popularity': avg_popularity,
-                    'avg_emerging': avg_emerging,
-                    'max_emerging': max_emerging,
-                    'confidence_score': min(1.0, len(trends) / 4.0 + max_emerging * 0.3),
-                    'trends': trends
-                }
-                
-                cross_platform_trends.append(aggregated_trend)
-                
+        for keyword, stats in zip(keyword_stats.index, keyword_stats.itertuples(index=False)):
+            trends = [trends_data[i] for i in positions[keyword]]
+            
+            # Create aggregated trend
+            aggregated_trend = {
+                'keyword': keyword,
+                'platforms': [t['platform'] for t in trends],
+                'source_count': int(stats.source_count),
+                'avg_popularity': float(stats.avg_popularity),
+                'avg_emerging': float(stats.avg_emerging),
+                'max_emerging': float(stats.max_emerging),
+                'confidence_score': float(stats.confidence_score),
+                'trends': trends
+            }
+            
+            cross_platform_trends.append(aggregated_trend)
+            
         # Sort by confidence and emerging score
+        if top_k is not None:
+            return heapq.nlargest(
+                top_k, cross_platform_trends,
+                key=lambda x: (x['confidence_score'], x['max_emerging'])
+            )
+            
         cross_platform_trends.sort(
             key=lambda x: (x['confidence_score'], x['max_emerging']), 
             reverse=True
@@ -293,13 +363,21 @@ class EmergingTrendDetector:
         Returns:
             Dictionary containing trend report
         """
+        count = len(emerging_trends)
+        confidence_scores = np.fromiter(
+            (t.get('confidence_score', 0) for t in emerging_trends), dtype=np.float64, count=count
+        )
+        emerging_scores = np.fromiter(
+            (t.get('emerging_score', 0) for t in emerging_trends), dtype=np.float64, count=count
+        )
+        
         report = {
             'generated_at': datetime.now().isoformat(),
             'summary': {
-                'total_emerging_trends': len(emerging_trends),
+                'total_emerging_trends': count,
                 'cross_platform_trends': len(cross_platform_trends),
-                'high_confidence_trends': len([t for t in emerging_trends if t.get('confidence_score', 0) > 0.8]),
-                'avg_emerging_score': np.mean([t.get('emerging_score', 0) for t in emerging_trends]) if emerging_trends else 0
+                'high_confidence_trends': int(np.count_nonzero(confidence_scores > 0.8)),
+                'avg_emerging_score': float(emerging_scores.mean()) if count else 0
             },
             'top_emerging_trends': emerging_trends[:10],
             'cross_platform_trends': cross_platform_trends[:10],
@@ -335,9 +413,21 @@ class EmergingTrendDetector:
         Returns:
             List of product suggestions
         """
-        suggestions = []
+        # Top 20 trends
+        return list(itertools.islice(self._iter_product_suggestions(emerging_trends), 20))
         
-        for trend in emerging_trends[:20]:  # Top 20 trends
+    def _iter_product_suggestions(self, 
+                                  emerging_trends: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield an Etsy product suggestion for each emerging trend.
+        
+        Args:
+            emerging_trends: List of emerging trends
+            
+        Yields:
+            Product suggestions
+        """
+        for trend in emerging_trends:
             keyword = trend['keyword']
             category = trend.get('category', 'general')
             emerging_score = trend.get('emerging_score', 0)
@@ -346,8 +436,8 @@ class EmergingTrendDetector:
             # Generate product title
             title = f"Personalized {keyword.title()} - Handmade Custom Design"
             
-            # Generate tags
-            tags = [
+            # Generate tags, followed by any category-specific tags
+            tags = (
                 keyword.lower(),
                 'handmade',
                 'personalized',
@@ -355,30 +445,18 @@ class EmergingTrendDetector:
                 category.lower(),
                 'etsy',
                 'trending'
-            ]
+            ) + _CATEGORY_TAGS.get(category, ())
             
-            # Add category-specific tags
-            if category == 'jewelry':
-                tags.extend(['necklace', 'bracelet', 'ring', 'earrings'])
-            elif category == 'home_decor':
-                tags.extend(['wall art', 'home decor', 'interior design'])
-            elif category == 'gifts':
-                tags.extend(['gift', 'present', 'special occasion'])
-                
-            suggestion = {
+            yield {
                 'keyword': keyword,
                 'emerging_score': emerging_score,
                 'confidence_score': confidence_score,
                 'category': category,
                 'suggested_title': title,
-                'suggested_tags': tags[:10],  # Limit to 10 tags
+                'suggested_tags': list(tags[:10]),  # Limit to 10 tags
                 'market_potential': self._assess_market_potential(emerging_score, confidence_score)
             }
             
-            suggestions.append(suggestion)
-            
-        return suggestions
-        
     def _assess_market_potential(self, emerging_score: float, confidence_score: float) -> str:
         """Assess market potential based on scores."""
         combined_score = (emerging_score + confidence_score) / 2
@@ -5,20 +5,111 @@ Calculates trend scores based on frequency, recency, growth, and cross-platform
 """
 
 import logging
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+HOUR_NS = 3600 * 1_000_000_000
+
+# Nanosecond value of unparseable or missing timestamps (pandas NaT); it
+# sorts before every real timestamp, so it never falls inside a time window
+NAT_NS = np.iinfo(np.int64).min
+
+# Timestamps ending in 'Z' or a UTC offset; anything else is naive local time
+_TZ_SUFFIX = re.compile(r'\d{2}:\d{2}.*(?:Z|[+-]\d{2}:?\d{2})$')
+
+_TEXT_FIELDS = ('title', 'description', 'text')
+
+PreparedData = Tuple[List[bytes], np.ndarray, np.ndarray]
+
+# Number of recently prepared data lists kept by ScoringEngine.prepare
+PREPARE_CACHE_SIZE = 4
+
 class ScoringEngine:
     """Calculates trend scores using multiple factors."""
     
     def __init__(self, config: Config):
         self.config = config
         self.weights = self.config.get_scoring_weights()
+        # Weights resolved once: frequency, recency, growth, cross-platform
+        self._w = (
+            self.weights.get('frequency_weight', 0.3),
+            self.weights.get('recency_weight', 0.3),
+            self.weights.get('growth_weight', 0.2),
+            self.weights.get('cross_platform_weight', 0.2)
+        )
+        self._prepare_cache: Dict[int, Tuple[List[Dict[str, Any]], int, PreparedData]] = {}
+    
+    def prepare(self, data: List[Dict[str, Any]]) -> PreparedData:
+        """
+        Precompute the per-item columns used by the scoring helpers.
+        
+        Results are cached per data list, so repeated scoring of the same
+        batch reuses them; the items are assumed not to change in place.
+        
+        Args:
+            data: Raw data items
+        
+        Returns:
+            Tuple of lowercased UTF-8 haystacks, UTC timestamps in ns (NAT_NS
+            where missing) and item sources
+        """
+        # The cache keeps a reference to each list so its id cannot be reused
+        cached = self._prepare_cache.get(id(data))
+        if cached is not None and cached[0] is data and cached[1] == len(data):
+            return cached[2]
+        
+        haystacks = [
+            ' '.join(item[field] or '' for field in _TEXT_FIELDS if field in item).lower().encode('utf-8')
+            for item in data
+        ]
+        
+        ts_ns = self._parse_timestamps([item.get('collected_at') for item in data])
+        
+        sources = np.empty(len(data), dtype=object)
+        sources[:] = [item.get('source', 'unknown') for item in data]
+        
+        prepared = (haystacks, ts_ns, sources)
+        if len(self._prepare_cache) >= PREPARE_CACHE_SIZE:
+            del self._prepare_cache[next(iter(self._prepare_cache))]
+        self._prepare_cache[id(data)] = (data, len(data), prepared)
+        
+        return prepared
     
-    def calculate_score(self, keyword: str, frequency: int, data: List[Dict[str, Any]]) -> float:
+    def _parse_timestamps(self, values: List[Any]) -> np.ndarray:
+        """
+        Bulk-parse ISO 8601 timestamps into UTC nanoseconds.
+        
+        Args:
+            values: Timestamp strings; anything else counts as missing
+        
+        Returns:
+            int64 array of UTC nanoseconds, NAT_NS where missing or unparseable
+        """
+        values = [value if isinstance(value, str) else None for value in values]
+        timestamps = pd.to_datetime(values, utc=True, format='ISO8601', errors='coerce')
+        ts_ns = timestamps.as_unit('ns').asi8.copy()
+        
+        # Naive timestamps are local time; shift them to UTC
+        naive = np.fromiter(
+            (value is not None and not _TZ_SUFFIX.search(value) for value in values),
+            dtype=bool, count=len(values)
+        )
+        naive &= ts_ns != NAT_NS
+        if naive.any():
+            local_offset = datetime.now().astimezone().utcoffset()
+            ts_ns[naive] -= local_offset // timedelta(microseconds=1) * 1000
+        
+        return ts_ns
+    
+    def calculate_score(self, keyword: str, frequency: int, data: List[Dict[str, Any]],
+                        prepared: Optional[PreparedData] = None) -> float:
         """
         Calculate a comprehensive score for a trend keyword.
         
@@ -26,23 +117,28 @@ class ScoringEngine:
             keyword: The keyword to score
             frequency: Frequency count of the keyword
             data: Raw data for additional analysis
+            prepared: Output of prepare(data), computed if not given
         
         Returns:
             Score between 0 and 1
         """
         try:
+            haystacks, ts_ns, sources = prepared if prepared is not None else self.prepare(data)
+            mask = self._match_mask(keyword.lower(), haystacks)
+            
             # Calculate individual scores
             frequency_score = self._calculate_frequency_score(frequency)
-            recency_score = self._calculate_recency_score(keyword, data)
-            growth_score = self._calculate_growth_score(keyword, data)
-            cross_platform_score = self._calculate_cross_platform_score(keyword, data)
+            recency_score = self._calculate_recency_score(mask, ts_ns)
+            growth_score = self._calculate_growth_score(mask, ts_ns)
+            cross_platform_score = self._calculate_cross_platform_score(mask, sources)
             
             # Apply weights
+            frequency_weight, recency_weight, growth_weight, cross_platform_weight = self._w
             final_score = (
-                frequency_score * self.weights.get('frequency_weight', 0.3) +
-                recency_score * self.weights.get('recency_weight', 0.3) +
-                growth_score * self.weights.get('growth_weight', 0.2) +
-                cross_platform_score * self.weights.get('cross_platform_weight', 0.2)
+                frequency_score * frequency_weight +
+                recency_score * recency_weight +
+                growth_score * growth_weight +
+                cross_platform_score * cross_platform_weight
             )
             
             return min(final_score, 1.0)  # Cap at 1.0
@@ -62,102 +158,53 @@ class ScoringEngine:
         else:
             return frequency / 100.0
     
-    def _calculate_recency_score(self, keyword: str, data: List[Dict[str, Any]]) -> float:
+    def _match_mask(self, keyword_lower: str, haystacks: List[bytes]) -> np.ndarray:
+        """Boolean mask of the items mentioning the lowercased keyword."""
+        needle = keyword_lower.encode('utf-8')
+        return np.fromiter((haystack.find(needle) != -1 for haystack in haystacks),
+                           dtype=bool, count=len(haystacks))
+    
+    def _window_counts(self, mask: np.ndarray, ts_ns: np.ndarray, *hours: int) -> np.ndarray:
+        """Count matched items newer than each of the given ages in hours."""
+        # Narrow to the matched timestamps once, then bin them against every
+        # cutoff in a single sorted search
+        matched = np.sort(ts_ns[mask])
+        cutoffs = time.time_ns() - np.array(hours, dtype=np.int64) * HOUR_NS
+        return matched.size - np.searchsorted(matched, cutoffs, side='right')
+    
+    def _calculate_recency_score(self, mask: np.ndarray, ts_ns: np.ndarray) -> float:
         """Calculate recency score based on how recent mentions are."""
-        keyword_lower = keyword.lower()
-        recent_mentions = 0
-        total_mentions = 0
-        
-        for item in data:
-            text = ''
-            if 'title' in item:
-                text += item['title'] + ' '
-            if 'description' in item:
-                text += item['description'] + ' '
-            if 'text' in item:
-                text += item['text'] + ' '
-            
-            if keyword_lower in text.lower():
-                total_mentions += 1
-                
-                # Check if mention is recent (within last 24 hours)
-                collected_at = item.get('collected_at')
-                if collected_at:
-                    try:
-                        mention_time = datetime.fromisoformat(collected_at.replace('Z', '+00:00'))
-                        if datetime.now(mention_time.tzinfo) - mention_time < timedelta(hours=24):
-                            recent_mentions += 1
-                    except:
-                        pass
+        total_mentions = int(np.count_nonzero(mask))
         
         if total_mentions == 0:
             return 0.0
         
+        # Mentions within the last 24 hours; unparseable timestamps never qualify
+        recent_mentions = int(self._window_counts(mask, ts_ns, 24)[0])
+        
         return recent_mentions / total_mentions
     
-    def _calculate_growth_score(self, keyword: str, data: List[Dict[str, Any]]) -> float:
+    def _calculate_growth_score(self, mask: np.ndarray, ts_ns: np.ndarray) -> float:
         """Calculate growth score based on trend direction."""
         # This is a simplified implementation
         # In practice, you'd compare current period vs previous period
-        keyword_lower = keyword.lower()
         
         # Count mentions by time period
-        recent_mentions = 0
-        older_mentions = 0
-        
-        for item in data:
-            text = ''
-            if 'title' in item:
-                text += item['title'] + ' '
-            if 'description' in item:
-                text += item['description'] + ' '
-            if 'text' in item:
-                text += item['text'] + ' '
-            
-            if keyword_lower in text.lower():
-                collected_at = item.get('collected_at')
-                if collected_at:
-                    try:
-                        mention_time = datetime.fromisoformat(collected_at.replace('Z', '+00:00'))
-                        now = datetime.now(mention_time.tzinfo)
-                        
-                        if now - mention_time < timedelta(hours=12):
-                            recent_mentions += 1
-                        elif now - mention_time < timedelta(hours=24):
-                            older_mentions += 1
-                    except:
-                        pass
+        within_half_day, within_day = self._window_counts(mask, ts_ns, 12, 24)
+        recent_mentions = int(within_half_day)
+        older_mentions = int(within_day - within_half_day)
         
         if older_mentions == 0:
             return 0.5  # Neutral score if no older data
         
         growth_rate = (recent_mentions - older_mentions) / max(older_mentions, 1)
         
-        # Normalize to 0-1 scale
-        if growth_rate >= 1.0:
-            return 1.0
-        elif growth_rate <= -0.5:
-            return 0.0
-        else:
-            return (growth_rate + 0.5) / 1.5
+        # Normalize to 0-1 scale: -0.5 maps to 0, 1.0 and above to 1
+        return min(1.0, max(0.0, (growth_rate + 0.5) / 1.5))
     
-    def _calculate_cross_platform_score(self, keyword: str, data: List[Dict[str, Any]]) -> float:
+    def _calculate_cross_platform_score(self, mask: np.ndarray, sources: np.ndarray) -> float:
         """Calculate cross-platform score based on presence across multiple sources."""
-        keyword_lower = keyword.lower()
-        platforms = set()
-        
-        for item in data:
-            text = ''
-            if 'title' in item:
-                text += item['title'] + ' '
-            if 'description' in item:
-                text += item['description'] + ' '
-            if 'text' in item:
-                text += item['text'] + ' '
-            
-            if keyword_lower in text.lower():
-                source = item.get('source', 'unknown')
-                platforms.add(source)
+        platforms = set(sources[mask])
         
         # Score based on number of platforms
         # More platforms = higher score
@@ -166,10 +213,13 @@ class ScoringEngine:
     
     def get_score_breakdown(self, keyword: str, frequency: int, data: List[Dict[str, Any]]) -> Dict[str, float]:
         """Get detailed score breakdown for a keyword."""
+        prepared = self.prepare(data)
+        haystacks, ts_ns, sources = prepared
+        mask = self._match_mask(keyword.lower(), haystacks)
         return {
             'frequency_score': self._calculate_frequency_score(frequency),
-            'recency_score': self._calculate_recency_score(keyword, data),
-            'growth_score': self._calculate_growth_score(keyword, data),
-            'cross_platform_score': self._calculate_cross_platform_score(keyword, data),
-            'final_score': self.calculate_score(keyword, frequency, data)
+            'recency_score': self._calculate_recency_score(mask, ts_ns),
+            'growth_score': self._calculate_growth_score(mask, ts_ns),
+            'cross_platform_score': self._calculate_cross_platform_score(mask, sources),
+            'final_score': self.calculate_score(keyword, frequency, data, prepared)
         } 
\ No newline at end of file
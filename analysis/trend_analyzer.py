@@ -5,12 +5,15 @@ Analyzes collected data to identify trending products and opportunities.
 """
 
 import asyncio
+import heapq
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import pandas as pd
 import numpy as np
-from collections import Counter
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.config import Config
 from utils.database import Database
@@ -19,6 +22,36 @@ from .scoring_engine import ScoringEngine
 
 logger = logging.getLogger(__name__)
 
+# Common stop words filtered out of keywords
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
+    'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'
+})
+
+# Item fields that keywords are extracted from
+_KEYWORD_FIELDS = ('title', 'description', 'text', 'search_term')
+
+# Trend table columns the analysis reads; everything else stays in the database
+_ANALYSIS_COLUMNS = ('title', 'description', 'source', 'collected_at')
+
+# Extra suggested tags, by keyword substrings; the first matching rule wins
+_TAG_RULES = (
+    (('jewelry', 'necklace'), ('handmade', 'personalized', 'gift')),
+    (('home', 'decor'), ('handmade', 'unique', 'artisan')),
+    (('gift',), ('personalized', 'custom', 'unique'))
+)
+_TAG_RULE_INDEX = {needle: i for i, (needles, tags) in enumerate(_TAG_RULES) for needle in needles}
+
+# Zero-width lookahead finds every (possibly overlapping) needle in one scan
+_TAG_NEEDLE_RE = re.compile('(?=(' + '|'.join(map(re.escape, _TAG_RULE_INDEX)) + '))')
+
+# Punctuation and other non-alphanumeric characters, removed from within words
+_NON_ALNUM_RE = re.compile(r'[^\w\s]|_')
+
 class TrendAnalyzer:
     """Analyzes trends from collected data and identifies opportunities."""
     
@@ -27,6 +60,8 @@ class TrendAnalyzer:
         self.db = Database(config)
         self.category_classifier = CategoryClassifier(config)
         self.scoring_engine = ScoringEngine(config)
+        # CPU-bound analysis stages run here to keep the event loop responsive
+        self._executor = ThreadPoolExecutor(max_workers=2)
     
     async def analyze_trends(self, mode: str = 'daily') -> Dict[str, Any]:
         """
@@ -43,31 +78,53 @@ class TrendAnalyzer:
         try:
             # Get recent data from database
             hours_back = 24 if mode == 'daily' else 168  # 1 day vs 1 week
-            recent_data = await self.db.get_recent_data(hours_back)
+            recent_data = await self.db.get_recent_data(hours_back, columns=_ANALYSIS_COLUMNS)
             
             if not recent_data:
                 logger.warning("No recent data found for analysis")
                 return self._get_empty_analysis()
             
-            # Extract keywords and phrases
-            keywords = self._extract_keywords(recent_data)
+            loop = asyncio.get_running_loop()
+            
+            # Count keywords and phrases and index their sources in a single pass
+            keyword_counts, source_keywords = await loop.run_in_executor(
+                self._executor, self._build_keyword_stats, recent_data
+            )
+            
+            # Rank the keywords once; the scored top 50 is a prefix of the top 100
+            top_keywords = keyword_counts.most_common(100)
+            
+            # Classify the top keywords once for categorizing and scoring
+            classifications = {
+                keyword: self.category_classifier.classify_keyword(keyword)
+                for keyword, count in top_keywords
+            }
             
             # Classify trends by category
-            categorized_trends = self._categorize_trends(keywords)
+            categorized_trends = self._categorize_trends(classifications)
             
             # Score trends
-            scored_trends = self._score_trends(keywords, recent_data)
+            scored_trends = await loop.run_in_executor(
+                self._executor, self._score_trends,
+                top_keywords[:50], recent_data, classifications, source_keywords
+            )
             
             # Identify opportunities
             opportunities = self._identify_opportunities(scored_trends, recent_data)
             
+            # Top trends, also stored column-wise so consumers can build
+            # frames without row-by-row dict assembly
+            top_trends = scored_trends[:20]
+            
             # Generate analysis results
             analysis_results = {
                 'mode': mode,
                 'analysis_timestamp': datetime.now().isoformat(),
                 'data_sources_analyzed': self._get_data_sources(recent_data),
                 'total_items_analyzed': len(recent_data),
-                'trending_keywords': scored_trends[:20],
+                'trending_keywords': top_trends,
+                'trending_columns': self._to_columns(top_trends),
+                'available_categories': sorted({trend['category'] for trend in top_trends if trend['category']}),
                 'categorized_trends': categorized_trends,
                 'opportunities': opportunities,
                 'summary': self._generate_summary(scored_trends, opportunities)
@@ -80,89 +137,73 @@ class TrendAnalyzer:
             logger.error(f"Error analyzing trends: {e}")
             return self._get_empty_analysis()
     
-    def _extract_keywords(self, data: List[Dict[str, Any]]) -> List[str]:
-        """Extract keywords from collected data."""
-        keywords = []
+    def _build_keyword_stats(self, data: List[Dict[str, Any]]) -> Tuple[Counter, Dict[str, Set[str]]]:
+        """
+        Count keywords across collected data in a single pass.
+        
+        Args:
+            data: Collected data items
+        
+        Returns:
+            Keyword counts and the set of keywords seen per source
+        """
+        keyword_counts = Counter()
+        source_keywords = defaultdict(set)
         
         for item in data:
-            # Extract from title
-            if 'title' in item:
-                keywords.extend(self._tokenize_text(item['title']))
-            
-            # Extract from description
-            if 'description' in item:
-                keywords.extend(self._tokenize_text(item['description']))
+            # Extract from title, description, text content and search terms,
+            # lowercasing and tokenizing the combined text once per item
+            combined = ' '.join(filter(None, (item[field] for field in _KEYWORD_FIELDS if field in item)))
+            tokens = self._tokenize_text(combined)
             
-            # Extract from text content
-            if 'text' in item:
-                keywords.extend(self._tokenize_text(item['text']))
-            
-            # Extract from search terms
-            if 'search_term' in item:
-                keywords.extend(self._tokenize_text(item['search_term']))
+            # Both updates run in C, so there is no per-token Python work
+            keyword_counts.update(tokens)
+            source_keywords[item.get('source', 'unknown')].update(tokens)
         
-        return keywords
+        return keyword_counts, source_keywords
     
     def _tokenize_text(self, text: str) -> List[str]:
         """Tokenize text into keywords."""
         if not text:
             return []
         
-        # Convert to lowercase and split
-        words = text.lower().split()
-        
-        # Filter out common stop words and short words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
-            'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'
-        }
-        
-        # Filter words
-        filtered_words = []
-        for word in words:
-            # Remove punctuation and clean
-            clean_word = ''.join(c for c in word if c.isalnum())
-            if (len(clean_word) > 2 and 
-                clean_word not in stop_words and 
-                not clean_word.isdigit()):
-                filtered_words.append(clean_word)
+        # Strip punctuation in one pass, then split into words
+        words = _NON_ALNUM_RE.sub('', text.lower()).split()
         
-        return filtered_words
+        # Filter out common stop words, short words and numbers
+        return [
+            word for word in words
+            if len(word) > 2 and word not in STOP_WORDS and not word.isdigit()
+        ]
     
-    def _categorize_trends(self, keywords: List[str]) -> Dict[str, List[str]]:
+    def _categorize_trends(self, classifications: Dict[str, Optional[str]]) -> Dict[str, List[str]]:
         """Categorize trends by product category."""
         categories = self.config.get_categories()
         categorized = {category: [] for category in categories.keys()}
         
-        # Count keyword frequency
-        keyword_counts = Counter(keywords)
-        
-        # Categorize keywords
-        for keyword, count in keyword_counts.most_common(100):
-            category = self.category_classifier.classify_keyword(keyword)
+        # Categorize keywords, most frequent first
+        for keyword, category in classifications.items():
             if category:
                 categorized[category].append(keyword)
         
         return categorized
     
-    def _score_trends(self, keywords: List[str], data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _score_trends(self, top_keywords: List[Tuple[str, int]], data: List[Dict[str, Any]],
+                      classifications: Dict[str, Optional[str]],
+                      source_keywords: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
         """Score trends using the scoring engine."""
-        keyword_counts = Counter(keywords)
+        prepared = self.scoring_engine.prepare(data)
         
         scored_trends = []
-        for keyword, count in keyword_counts.most_common(50):
-            score = self.scoring_engine.calculate_score(keyword, count, data)
+        for keyword, count in top_keywords:
+            score = self.scoring_engine.calculate_score(keyword, count, data, prepared)
             
             trend_data = {
                 'keyword': keyword,
                 'frequency': count,
                 'score': score,
-                'category': self.category_classifier.classify_keyword(keyword),
-                'sources': self._get_keyword_sources(keyword, data)
+                'category': classifications[keyword],
+                'sources': self._get_keyword_sources(keyword, source_keywords)
             }
             scored_trends.append(trend_data)
         
@@ -173,41 +214,31 @@ class TrendAnalyzer:
     
     def _identify_opportunities(self, scored_trends: List[Dict[str, Any]], data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identify business opportunities from trends."""
-        opportunities = []
+        min_score = self.config.get('analysis.min_score', 0.1)
+        candidates = [trend for trend in scored_trends[:20] if trend['score'] > min_score]  # Top 20 trends
         
-        for trend in scored_trends[:20]:  # Top 20 trends
-            if trend['score'] > self.config.get('analysis.min_score', 0.1):
-                opportunity = {
-                    'keyword': trend['keyword'],
-                    'category': trend['category'],
-                    'score': trend['score'],
-                    'frequency': trend['frequency'],
-                    'sources': trend['sources'],
-                    'suggested_tags': self._generate_suggested_tags(trend['keyword']),
-                    'market_potential': self._assess_market_potential(trend, data),
-                    'competition_level': self._assess_competition(trend, data)
-                }
-                opportunities.append(opportunity)
+        potentials, competitions = self._assess_bulk(
+            np.fromiter((trend['score'] for trend in candidates), dtype=np.float64, count=len(candidates)),
+            np.fromiter((trend['frequency'] for trend in candidates), dtype=np.int64, count=len(candidates))
+        )
         
-        return opportunities
+        return [
+            {
+                'keyword': trend['keyword'],
+                'category': trend['category'],
+                'score': trend['score'],
+                'frequency': trend['frequency'],
+                'sources': trend['sources'],
+                'suggested_tags': self._generate_suggested_tags(trend['keyword']),
+                'market_potential': potential,
+                'competition_level': competition
+            }
+            for trend, potential, competition in zip(candidates, potentials, competitions)
+        ]
     
-    def _get_keyword_sources(self, keyword: str, data: List[Dict[str, Any]]) -> List[str]:
+    def _get_keyword_sources(self, keyword: str, source_keywords: Dict[str, Set[str]]) -> List[str]:
         """Get sources where a keyword appears."""
-        sources = set()
-        
-        for item in data:
-            text = ''
-            if 'title' in item:
-                text += item['title'] + ' '
-            if 'description' in item:
-                text += item['description'] + ' '
-            if 'text' in item:
-                text += item['text'] + ' '
-            
-            if keyword.lower() in text.lower():
-                sources.add(item.get('source', 'unknown'))
-        
-        return list(sources)
+        return [source for source, keywords in source_keywords.items() if keyword in keywords]
     
     def _generate_suggested_tags(self, keyword: str) -> List[str]:
         """Generate suggested Etsy tags for a keyword."""
@@ -216,39 +247,48 @@ class TrendAnalyzer:
         base_tags = [keyword]
         
         # Add related tags based on keyword
-        if 'jewelry' in keyword or 'necklace' in keyword:
-            base_tags.extend(['handmade', 'personalized', 'gift'])
-        elif 'home' in keyword or 'decor' in keyword:
-            base_tags.extend(['handmade', 'unique', 'artisan'])
-        elif 'gift' in keyword:
-            base_tags.extend(['personalized', 'custom', 'unique'])
+        matched_rules = [_TAG_RULE_INDEX[needle] for needle in _TAG_NEEDLE_RE.findall(keyword)]
+        if matched_rules:
+            base_tags.extend(_TAG_RULES[min(matched_rules)][1])
         
         return base_tags[:5]  # Return top 5 tags
     
-    def _assess_market_potential(self, trend: Dict[str, Any], data: List[Dict[str, Any]]) -> str:
-        """Assess market potential for a trend."""
-        score = trend['score']
-        frequency = trend['frequency']
+    def _assess_bulk(self, scores: np.ndarray, frequencies: np.ndarray) -> Tuple[List[str], List[str]]:
+        """
+        Assess market potential and competition level for many trends at once.
+        
+        Args:
+            scores: Trend scores
+            frequencies: Trend frequencies, aligned with scores
+        
+        Returns:
+            Market potential and competition level labels per trend
+        """
+        potentials = np.select(
+            [(scores > 0.8) & (frequencies > 50), (scores > 0.5) & (frequencies > 20)],
+            ['High', 'Medium'],
+            default='Low'
+        )
         
-        if score > 0.8 and frequency > 50:
-            return 'High'
-        elif score > 0.5 and frequency > 20:
-            return 'Medium'
-        else:
-            return 'Low'
-    
-    def _assess_competition(self, trend: Dict[str, Any], data: List[Dict[str, Any]]) -> str:
-        """Assess competition level for a trend."""
         # This is a simplified implementation
         # In practice, you'd analyze actual competition data
-        frequency = trend['frequency']
+        competitions = np.select(
+            [frequencies > 100, frequencies > 50],
+            ['High', 'Medium'],
+            default='Low'
+        )
         
-        if frequency > 100:
-            return 'High'
-        elif frequency > 50:
-            return 'Medium'
-        else:
-            return 'Low'
+        return potentials.tolist(), competitions.tolist()
+    
+    def _to_columns(self, trends: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Convert trend records into parallel per-field lists."""
+        return {
+            'keyword': [trend['keyword'] for trend in trends],
+            'score': [trend['score'] for trend in trends],
+            'frequency': [trend['frequency'] for trend in trends],
+            'category': [trend['category'] for trend in trends],
+            'sources': [trend['sources'] for trend in trends]
+        }
     
     def _get_data_sources(self, data: List[Dict[str, Any]]) -> List[str]:
         """Get list of data sources from the data."""
@@ -269,24 +309,24 @@ class TrendAnalyzer:
     
     def _get_top_categories(self, scored_trends: List[Dict[str, Any]]) -> List[str]:
         """Get top trending categories."""
-        category_scores = {}
+        category_scores = defaultdict(float)
         for trend in scored_trends:
             category = trend.get('category')
             if category:
-                category_scores[category] = category_scores.get(category, 0) + trend['score']
+                category_scores[category] += trend['score']
         
-        sorted_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
-        return [category for category, score in sorted_categories[:5]]
+        top_categories = heapq.nlargest(5, category_scores.items(), key=lambda x: x[1])
+        return [category for category, score in top_categories]
     
     def _get_trending_sources(self, scored_trends: List[Dict[str, Any]]) -> List[str]:
         """Get top trending data sources."""
-        source_scores = {}
+        source_scores = defaultdict(float)
         for trend in scored_trends:
             for source in trend.get('sources', []):
-                source_scores[source] = source_scores.get(source, 0) + trend['score']
+                source_scores[source] += trend['score']
         
-        sorted_sources = sorted(source_scores.items(), key=lambda x: x[1], reverse=True)
-        return [source for source, score in sorted_sources[:5]]
+        top_sources = heapq.nlargest(5, source_scores.items(), key=lambda x: x[1])
+        return [source for source, score in top_sources]
     
     def _get_empty_analysis(self) -> Dict[str, Any]:
         """Return empty analysis structure."""
@@ -296,6 +336,8 @@ class TrendAnalyzer:
             'data_sources_analyzed': [],
             'total_items_analyzed': 0,
             'trending_keywords': [],
+            'trending_columns': self._to_columns([]),
+            'available_categories': [],
             'categorized_trends': {},
             'opportunities': [],
             'summary': {
@@ -9,13 +9,13 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import json
 from pathlib import Path
 import sys
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from utils import fastjson
 from utils.config import Config
 from analysis.trend_analyzer import TrendAnalyzer
 from data_ingestion.collector_manager import DataCollectorManager
@@ -108,20 +108,13 @@ def show_dashboard():
             
             # Top trends
             st.subheader("🔥 Top Trending Keywords")
-            trending_keywords = analysis_data.get('trending_keywords', [])
+            df_all_trends = load_trends_frame(analysis_data)
             
-            if trending_keywords:
-                df_trends = pd.DataFrame(trending_keywords[:10])
+            if not df_all_trends.empty:
+                df_trends = df_all_trends.head(10)
                 
                 # Create trend chart
-                fig = px.bar(
-                    df_trends,
-                    x='keyword',
-                    y='score',
-                    title="Top 10 Trending Keywords",
-                    labels={'keyword': 'Keyword', 'score': 'Trend Score'}
-                )
-                fig.update_layout(xaxis_tickangle=-45)
+                fig = _build_top10_bar(tuple(df_trends['keyword']), tuple(df_trends['score']))
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Trend table
@@ -147,12 +140,7 @@ def show_dashboard():
                 df_categories = pd.DataFrame(category_data)
                 
                 # Category chart
-                fig = px.pie(
-                    df_categories,
-                    values='Keywords',
-                    names='Category',
-                    title="Trends by Category"
-                )
+                fig = _build_category_pie(tuple(df_categories['Category']), tuple(df_categories['Keywords']))
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Category table
@@ -224,31 +212,32 @@ def show_trend_analysis():
             with col1:
                 min_score = st.slider("Minimum Score", 0.0, 1.0, 0.1, 0.1)
             
+            df_trends = load_trends_frame(analysis_data)
+            
+            # Categories are stored at analysis time; derive them for older results
+            available_categories = analysis_data.get('available_categories')
+            if available_categories is None:
+                available_categories = sorted(df_trends['category'].dropna().unique())
+            
             with col2:
                 selected_category = st.selectbox(
                     "Category Filter",
-                    ["All"] + list(set(trend.get('category') for trend in trending_keywords if trend.get('category')))
+                    ["All"] + available_categories
                 )
             
             # Filter data
-            filtered_trends = []
-            for trend in trending_keywords:
-                if trend['score'] >= min_score:
-                    if selected_category == "All" or trend.get('category') == selected_category:
-                        filtered_trends.append(trend)
+            mask = df_trends['score'] >= min_score
+            if selected_category != "All":
+                mask &= df_trends['category'] == selected_category
+            df_filtered = df_trends[mask].reset_index(drop=True)
             
-            if filtered_trends:
-                df_filtered = pd.DataFrame(filtered_trends)
-                
+            if not df_filtered.empty:
                 # Trend visualization
-                fig = px.scatter(
-                    df_filtered,
-                    x='frequency',
-                    y='score',
-                    size='score',
-                    color='category',
-                    hover_data=['keyword', 'sources'],
-                    title="Trend Analysis Scatter Plot"
+                fig = _build_trend_scatter(
+                    analysis_data.get('analysis_timestamp'),
+                    min_score,
+                    selected_category,
+                    df_filtered
                 )
                 st.plotly_chart(fig, use_container_width=True)
                 
@@ -364,6 +353,48 @@ def show_settings():
         config.save()
         st.success("Configuration saved!")
 
+@st.cache_data
+def _build_top10_bar(keywords: tuple, scores: tuple):
+    """Build the top trending keywords bar chart."""
+    fig = px.bar(
+        pd.DataFrame({'keyword': keywords, 'score': scores}),
+        x='keyword',
+        y='score',
+        title="Top 10 Trending Keywords",
+        labels={'keyword': 'Keyword', 'score': 'Trend Score'}
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_data
+def _build_category_pie(categories: tuple, counts: tuple):
+    """Build the trends by category pie chart."""
+    return px.pie(
+        pd.DataFrame({'Category': categories, 'Keywords': counts}),
+        values='Keywords',
+        names='Category',
+        title="Trends by Category"
+    )
+
+@st.cache_data
+def _build_trend_scatter(analysis_timestamp, min_score, selected_category, _df_filtered):
+    """Build the trend scatter plot; cached on the analysis and filter values, not the frame."""
+    return px.scatter(
+        _df_filtered,
+        x='frequency',
+        y='score',
+        size='score',
+        color='category',
+        hover_data=['keyword', 'sources'],
+        title="Trend Analysis Scatter Plot"
+    )
+
+@st.cache_data(ttl=60)
+def _load_json(path: str, mtime_ns: int):
+    """Parse a JSON file; mtime_ns keys the cache so rewritten files are reloaded."""
+    raw = Path(path).read_bytes()
+    return fastjson.loads(raw)
+
 def load_recent_analysis():
     """Load recent analysis results."""
     try:
@@ -374,8 +405,7 @@ def load_recent_analysis():
             # Get most recent file
             latest_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
             
-            with open(latest_file, 'r') as f:
-                return json.load(f)
+            return _load_json(str(latest_file), latest_file.stat().st_mtime_ns)
         
         return None
     
@@ -383,6 +413,21 @@ def load_recent_analysis():
         st.error(f"Error loading analysis data: {e}")
         return None
 
+def load_trends_frame(analysis_data):
+    """Build the trending keywords frame, from stored columns when available."""
+    columns = analysis_data.get('trending_columns')
+    if columns:
+        df = pd.DataFrame(columns)
+    else:
+        # Results saved before columns were stored
+        df = pd.DataFrame(analysis_data.get('trending_keywords', []))
+    
+    if df.empty:
+        return df
+    
+    # Narrow dtypes halve what is serialized into the Plotly figures
+    return df.astype({'score': 'float32', 'frequency': 'int32'})
+
 def save_analysis_results(results):
     """Save analysis results to file."""
     try:
@@ -392,8 +437,7 @@ def save_analysis_results(results):
         filepath = Path(filename)
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        filepath.write_bytes(fastjson.dumps(results, indent=True))
         
         st.success(f"Analysis results saved to {filename}")
     
@@ -4,19 +4,27 @@ Streamlit Dashboard Application
 
 Interactive dashboard for visualizing trend detection results,
 including real-time data, charts, and filtering capabilities.
+
+Plotly is imported where charts are built, so pages without charts
+start without loading it.
 """
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime, timedelta
+import html
+import io
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import sqlite3
+import threading
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 # Page configuration
 st.set_page_config(
@@ -54,6 +62,251 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Per platform/category aggregates backing the metrics and summary charts;
+# sums and non-null counts let coarser groupings recombine exact means
+AGGREGATE_COLUMNS = [
+    'platform', 'category', 'trend_count',
+    'emerging_sum', 'emerging_n', 'emerging_hits',
+    'confidence_sum', 'confidence_n', 'confidence_hits',
+    'popularity_sum', 'popularity_n'
+]
+
+# Low-cardinality label columns, stored as categoricals so grouping and
+# filtering work on integer codes
+CATEGORICAL_COLUMNS = ('platform', 'category')
+
+def _compact_trends(trends_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the label columns of a trends frame to categoricals, keywords to
+    Arrow strings and dates to datetimes.
+    """
+    dtypes = {col: 'category' for col in CATEGORICAL_COLUMNS}
+    if pyarrow is not None:
+        # Arrow-backed keywords let searches run in Arrow's string kernels
+        dtypes['keyword'] = 'string[pyarrow]'
+        
+    trends_df = trends_df.astype(dtypes)
+    
+    # Datetime dates make range filters integer comparisons
+    trends_df['date'] = pd.to_datetime(trends_df['date'], format='ISO8601', errors='coerce')
+    
+    return trends_df
+
+def _aggregate_trends(trends_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate a trends frame the same way the dashboard SQL does."""
+    # Threshold flags are assigned as columns so every aggregation below is
+    # a built-in name; a Python callable in agg() drops to a per-group loop
+    flagged = trends_df.assign(
+        emerging_hit=trends_df['emerging_score'] > 0.75,
+        confidence_hit=trends_df['confidence_score'] > 0.8
+    )
+    
+    return flagged.groupby(['platform', 'category'], dropna=False, observed=True).agg(
+        trend_count=('keyword', 'size'),
+        emerging_sum=('emerging_score', 'sum'),
+        emerging_n=('emerging_score', 'count'),
+        emerging_hits=('emerging_hit', 'sum'),
+        confidence_sum=('confidence_score', 'sum'),
+        confidence_n=('confidence_score', 'count'),
+        confidence_hits=('confidence_hit', 'sum'),
+        popularity_sum=('popularity_score', 'sum'),
+        popularity_n=('popularity_score', 'count')
+    ).reset_index()[AGGREGATE_COLUMNS]
+
+def _with_growth_rate(snapshots_df: pd.DataFrame) -> pd.DataFrame:
+    """Add the day-over-day total trends growth rate, in percent."""
+    return snapshots_df.assign(growth_rate=snapshots_df['total_trends'].pct_change() * 100)
+
+# Serializes use of the shared history database connection across sessions
+_CONNECTION_LOCK = threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _get_connection(db_path: str) -> sqlite3.Connection:
+    """Open one shared, read-tuned connection to the trends history database."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.executescript("""
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+        PRAGMA temp_store=MEMORY;
+    """)
+    return conn
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_trends(db_path: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Load recent trends, their aggregates and daily snapshots from the SQLite database."""
+    conn = _get_connection(db_path)
+    
+    # The shared connection is used by one query sequence at a time
+    with _CONNECTION_LOCK:
+        # Load recent trends
+        query = """
+        SELECT keyword, platform, category, popularity_score, 
+               emerging_score, confidence_score, date
+        FROM trends 
+        WHERE date >= date('now', '-7 days')
+        ORDER BY emerging_score DESC
+        """
+        
+        trends_df = _compact_trends(pd.read_sql_query(query, conn))
+        
+        # Aggregate in SQLite, which seeks the date range through idx_trends_date
+        aggregate_query = """
+        SELECT platform, category, COUNT(*) AS trend_count,
+               TOTAL(emerging_score) AS emerging_sum, COUNT(emerging_score) AS emerging_n,
+               TOTAL(emerging_score > 0.75) AS emerging_hits,
+               TOTAL(confidence_score) AS confidence_sum, COUNT(confidence_score) AS confidence_n,
+               TOTAL(confidence_score > 0.8) AS confidence_hits,
+               TOTAL(popularity_score) AS popularity_sum, COUNT(popularity_score) AS popularity_n
+        FROM trends 
+        WHERE date >= date('now', '-7 days')
+        GROUP BY platform, category
+        """
+        
+        agg_df = pd.read_sql_query(aggregate_query, conn)
+        
+        # Load daily snapshots
+        snapshot_query = """
+        SELECT date, total_trends, emerging_trends, high_confidence_trends
+        FROM daily_snapshots 
+        WHERE date >= date('now', '-30 days')
+        ORDER BY date
+        """
+        
+        snapshots_df = _with_growth_rate(pd.read_sql_query(snapshot_query, conn))
+        
+    return trends_df, agg_df, snapshots_df
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_demo_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Create demo trends, their aggregates and daily snapshots for testing."""
+    # Create sample data
+    dates = pd.date_range(start='2024-01-01', end='2024-01-07', freq='D')
+    platforms = ['google_trends', 'reddit', 'pinterest', 'etsy']
+    categories = ['jewelry', 'home_decor', 'gifts', 'fashion']
+    
+    # 5 trends per platform/category/day, materialized in one allocation
+    index = pd.MultiIndex.from_product(
+        [dates.strftime('%Y-%m-%d'), platforms, categories, range(5)],
+        names=['date', 'platform', 'category', 'i']
+    )
+    n = len(index)
+    
+    trends_df = pd.DataFrame({
+        'popularity_score': np.random.uniform(0, 100, n),
+        'emerging_score': np.random.uniform(0, 1, n),
+        'confidence_score': np.random.uniform(0, 1, n)
+    }, index=index).reset_index()
+    
+    trends_df['keyword'] = 'sample_trend_' + trends_df['i'].astype(str) + '_' + trends_df['category']
+    trends_df = _compact_trends(trends_df[[
+        'keyword', 'platform', 'category', 'popularity_score',
+        'emerging_score', 'confidence_score', 'date'
+    ]])
+    
+    # Create snapshots data; flags are summed with built-in aggregations
+    snapshots_df = trends_df.assign(
+        emerging_trends=trends_df['emerging_score'] > 0.75,
+        high_confidence_trends=trends_df['confidence_score'] > 0.8
+    ).groupby('date', sort=False).agg(
+        total_trends=('keyword', 'size'),
+        emerging_trends=('emerging_trends', 'sum'),
+        high_confidence_trends=('high_confidence_trends', 'sum')
+    ).reset_index()
+    
+    return trends_df, _aggregate_trends(trends_df), _with_growth_rate(snapshots_df)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _summarize_trends(agg_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Build the heatmap, platform and category tables from the aggregates once per load."""
+    # Heatmap of trend counts
+    heatmap_data = agg_df.dropna(subset=['category']).pivot(
+        index='platform', columns='category', values='trend_count'
+    ).fillna(0).astype(int)
+    
+    # Platform statistics
+    totals = agg_df.groupby('platform', observed=True)[AGGREGATE_COLUMNS[2:]].sum()
+    platform_stats = pd.DataFrame({
+        'Avg Emerging Score': totals['emerging_sum'] / totals['emerging_n'],
+        'Trend Count': totals['emerging_n'],
+        'Avg Confidence': totals['confidence_sum'] / totals['confidence_n'],
+        'Avg Popularity': totals['popularity_sum'] / totals['popularity_n']
+    }).round(3)
+    
+    # Category statistics
+    totals = agg_df.groupby('category', observed=True)[AGGREGATE_COLUMNS[2:]].sum()
+    category_stats = pd.DataFrame({
+        'Avg Emerging Score': totals['emerging_sum'] / totals['emerging_n'],
+        'Trend Count': totals['emerging_n'],
+        'Avg Confidence': totals['confidence_sum'] / totals['confidence_n']
+    }).round(3)
+    
+    return heatmap_data, platform_stats, category_stats
+
+@st.cache_resource(show_spinner=False)
+def _build_heatmap_fig(heatmap_data: pd.DataFrame):
+    """Build the platform/category heatmap once per distinct heatmap table."""
+    import plotly.express as px
+    
+    fig = px.imshow(
+        heatmap_data,
+        title="Trend Distribution by Platform and Category",
+        color_continuous_scale="Viridis",
+        aspect="auto"
+    )
+    
+    fig.update_layout(
+        xaxis_title="Category",
+        yaxis_title="Platform",
+        height=400
+    )
+    
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def _build_growth_fig(snapshots_df: pd.DataFrame):
+    """Build the four growth subplots once per distinct snapshots table."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Total Trends', 'Emerging Trends', 'High Confidence Trends', 'Trend Growth Rate'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]]
+    )
+    
+    # Total trends
+    fig.add_trace(
+        go.Scatter(x=snapshots_df['date'], y=snapshots_df['total_trends'],
+                  mode='lines+markers', name='Total Trends'),
+        row=1, col=1
+    )
+    
+    # Emerging trends
+    fig.add_trace(
+        go.Scatter(x=snapshots_df['date'], y=snapshots_df['emerging_trends'],
+                  mode='lines+markers', name='Emerging Trends'),
+        row=1, col=2
+    )
+    
+    # High confidence trends
+    fig.add_trace(
+        go.Scatter(x=snapshots_df['date'], y=snapshots_df['high_confidence_trends'],
+                  mode='lines+markers', name='High Confidence'),
+        row=2, col=1
+    )
+    
+    # Growth rate
+    fig.add_trace(
+        go.Scatter(x=snapshots_df['date'], y=snapshots_df['growth_rate'],
+                  mode='lines+markers', name='Growth Rate (%)'),
+        row=2, col=2
+    )
+    
+    fig.update_layout(height=600, showlegend=True)
+    
+    return fig
+
 class TrendDashboard:
     """Main dashboard class for trend visualization."""
     
@@ -75,67 +328,15 @@ class TrendDashboard:
             st.error(f"Error loading data: {e}")
             self.load_demo_data()
             
-    def load_from_database(self):
-        """Load data from SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        
-        # Load recent trends
-        query = """
-        SELECT keyword, platform, category, popularity_score, 
-               emerging_score, confidence_score, date
-        FROM trends 
-        WHERE date >= date('now', '-7 days')
-        ORDER BY emerging_score DESC
-        """
-        
-        self.trends_df = pd.read_sql_query(query, conn)
+        self.heatmap_data, self.platform_stats, self.category_stats = _summarize_trends(self.agg_df)
         
-        # Load daily snapshots
-        snapshot_query = """
-        SELECT date, total_trends, emerging_trends, high_confidence_trends
-        FROM daily_snapshots 
-        WHERE date >= date('now', '-30 days')
-        ORDER BY date
-        """
-        
-        self.snapshots_df = pd.read_sql_query(snapshot_query, conn)
-        conn.close()
+    def load_from_database(self):
+        """Load data from SQLite database; cached across reruns."""
+        self.trends_df, self.agg_df, self.snapshots_df = _load_trends(str(self.db_path))
         
     def load_demo_data(self):
-        """Load demo data for testing."""
-        # Create sample data
-        dates = pd.date_range(start='2024-01-01', end='2024-01-07', freq='D')
-        platforms = ['google_trends', 'reddit', 'pinterest', 'etsy']
-        categories = ['jewelry', 'home_decor', 'gifts', 'fashion']
-        
-        data = []
-        for date in dates:
-            for platform in platforms:
-                for category in categories:
-                    for i in range(5):  # 5 trends per platform/category/day
-                        data.append({
-                            'keyword': f'sample_trend_{i}_{category}',
-                            'platform': platform,
-                            'category': category,
-                            'popularity_score': np.random.uniform(0, 100),
-                            'emerging_score': np.random.uniform(0, 1),
-                            'confidence_score': np.random.uniform(0, 1),
-                            'date': date.strftime('%Y-%m-%d')
-                        })
-                        
-        self.trends_df = pd.DataFrame(data)
-        
-        # Create snapshots data
-        snapshot_data = []
-        for date in dates:
-            snapshot_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'total_trends': len([d for d in data if d['date'] == date.strftime('%Y-%m-%d')]),
-                'emerging_trends': len([d for d in data if d['date'] == date.strftime('%Y-%m-%d') and d['emerging_score'] > 0.75]),
-                'high_confidence_trends': len([d for d in data if d['date'] == date.strftime('%Y-%m-%d') and d['confidence_score'] > 0.8])
-            })
-            
-        self.snapshots_df = pd.DataFrame(snapshot_data)
+        """Load demo data for testing; cached across reruns."""
+        self.trends_df, self.agg_df, self.snapshots_df = _load_demo_data()
         
     def render_header(self):
         """Render the main header."""
@@ -150,20 +351,23 @@ class TrendDashboard:
         """Render key metrics."""
         col1, col2, col3, col4 = st.columns(4)
         
+        # Totals over the precomputed platform/category aggregates
+        totals = self.agg_df[AGGREGATE_COLUMNS[2:]].sum()
+        
         with col1:
-            total_trends = len(self.trends_df)
+            total_trends = int(totals['trend_count'])
             st.metric("Total Trends", total_trends)
             
         with col2:
-            emerging_trends = len(self.trends_df[self.trends_df['emerging_score'] > 0.75])
+            emerging_trends = int(totals['emerging_hits'])
             st.metric("Emerging Trends", emerging_trends)
             
         with col3:
-            high_confidence = len(self.trends_df[self.trends_df['confidence_score'] > 0.8])
+            high_confidence = int(totals['confidence_hits'])
             st.metric("High Confidence", high_confidence)
             
         with col4:
-            avg_emerging = self.trends_df['emerging_score'].mean()
+            avg_emerging = totals['emerging_sum'] / totals['emerging_n'] if totals['emerging_n'] else float('nan')
             st.metric("Avg Emerging Score", f"{avg_emerging:.3f}")
             
     def render_trending_keywords(self):
@@ -201,25 +405,16 @@ class TrendDashboard:
         if not filtered_df.empty:
             top_trends = filtered_df.head(20)
             
-            # Create trend cards
-            for _, trend in top_trends.iterrows():
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"**{trend['keyword']}**")
-                        st.caption(f"Category: {trend['category']}")
-                        
-                    with col2:
-                        st.metric("Emerging Score", f"{trend['emerging_score']:.3f}")
-                        
-                    with col3:
-                        st.metric("Confidence", f"{trend['confidence_score']:.3f}")
-                        
-                    with col4:
-                        st.metric("Platform", trend['platform'])
-                        
-                    st.divider()
+            # Create trend cards as one markdown block rather than a widget tree per trend
+            cards = "\n".join(
+                f'<div class="trend-card"><b>{html.escape(str(trend.keyword))}</b><br>'
+                f'<small>Category: {html.escape(str(trend.category))}</small><br>'
+                f'Emerging Score: {trend.emerging_score:.3f} &middot; '
+                f'Confidence: {trend.confidence_score:.3f} &middot; '
+                f'Platform: {html.escape(str(trend.platform))}</div>'
+                for trend in top_trends.itertuples(index=False)
+            )
+            st.markdown(cards, unsafe_allow_html=True)
         else:
             st.info("No trends match the current filters.")
             
@@ -227,23 +422,8 @@ class TrendDashboard:
         """Render source frequency heatmap."""
         st.subheader("📊 Source Frequency Heatmap")
         
-        # Create heatmap data
-        heatmap_data = self.trends_df.groupby(['platform', 'category']).size().unstack(fill_value=0)
-        
-        # Create heatmap
-        fig = px.imshow(
-            heatmap_data,
-            title="Trend Distribution by Platform and Category",
-            color_continuous_scale="Viridis",
-            aspect="auto"
-        )
-        
-        fig.update_layout(
-            xaxis_title="Category",
-            yaxis_title="Platform",
-            height=400
-        )
-        
+        # Create heatmap, reused across reruns while the data is unchanged
+        fig = _build_heatmap_fig(self.heatmap_data)
         st.plotly_chart(fig, use_container_width=True)
         
     def render_trend_growth(self):
@@ -252,43 +432,8 @@ class TrendDashboard:
         
         # Prepare time series data
         if not self.snapshots_df.empty:
-            fig = make_subplots(
-                rows=2, cols=2,
-                subplot_titles=('Total Trends', 'Emerging Trends', 'High Confidence Trends', 'Trend Growth Rate'),
-                specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                       [{"secondary_y": False}, {"secondary_y": False}]]
-            )
-            
-            # Total trends
-            fig.add_trace(
-                go.Scatter(x=self.snapshots_df['date'], y=self.snapshots_df['total_trends'],
-                          mode='lines+markers', name='Total Trends'),
-                row=1, col=1
-            )
-            
-            # Emerging trends
-            fig.add_trace(
-                go.Scatter(x=self.snapshots_df['date'], y=self.snapshots_df['emerging_trends'],
-                          mode='lines+markers', name='Emerging Trends'),
-                row=1, col=2
-            )
-            
-            # High confidence trends
-            fig.add_trace(
-                go.Scatter(x=self.snapshots_df['date'], y=self.snapshots_df['high_confidence_trends'],
-                          mode='lines+markers', name='High Confidence'),
-                row=2, col=1
-            )
-            
-            # Growth rate
-            growth_rate = self.snapshots_df['total_trends'].pct_change() * 100
-            fig.add_trace(
-                go.Scatter(x=self.snapshots_df['date'], y=growth_rate,
-                          mode='lines+markers', name='Growth Rate (%)'),
-                row=2, col=2
-            )
-            
-            fig.update_layout(height=600, showlegend=True)
+            # Subplots are reused across reruns while the snapshots are unchanged
+            fig = _build_growth_fig(self.snapshots_df)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No time series data available.")
@@ -297,14 +442,8 @@ class TrendDashboard:
         """Render platform performance analysis."""
         st.subheader("🔍 Platform Performance Analysis")
         
-        # Platform statistics
-        platform_stats = self.trends_df.groupby('platform').agg({
-            'emerging_score': ['mean', 'count'],
-            'confidence_score': 'mean',
-            'popularity_score': 'mean'
-        }).round(3)
-        
-        platform_stats.columns = ['Avg Emerging Score', 'Trend Count', 'Avg Confidence', 'Avg Popularity']
+        # Platform statistics, precomputed per data load
+        platform_stats = self.platform_stats
         
         # Display platform stats
         col1, col2 = st.columns(2)
@@ -315,6 +454,8 @@ class TrendDashboard:
             
         with col2:
             # Platform performance chart
+            import plotly.express as px
+            
             fig = px.bar(
                 x=platform_stats.index,
                 y=platform_stats['Avg Emerging Score'],
@@ -330,13 +471,8 @@ class TrendDashboard:
         """Render category insights."""
         st.subheader("📂 Category Insights")
         
-        # Category statistics
-        category_stats = self.trends_df.groupby('category').agg({
-            'emerging_score': ['mean', 'count'],
-            'confidence_score': 'mean'
-        }).round(3)
-        
-        category_stats.columns = ['Avg Emerging Score', 'Trend Count', 'Avg Confidence']
+        # Category statistics, precomputed per data load
+        category_stats = self.category_stats
         
         # Display category stats
         col1, col2 = st.columns(2)
@@ -347,6 +483,8 @@ class TrendDashboard:
             
         with col2:
             # Category performance chart
+            import plotly.express as px
+            
             fig = px.pie(
                 values=category_stats['Trend Count'],
                 names=category_stats.index,
@@ -364,8 +502,10 @@ class TrendDashboard:
         search_term = st.text_input("Search keywords:", placeholder="Enter keyword to search...")
         
         if search_term:
+            # Literal, case-insensitive match; runs in Arrow's substring kernel
+            # for Arrow-backed keywords
             search_results = self.trends_df[
-                self.trends_df['keyword'].str.contains(search_term, case=False, na=False)
+                self.trends_df['keyword'].str.contains(search_term, case=False, regex=False, na=False)
             ]
             
             if not search_results.empty:
@@ -399,8 +539,7 @@ class TrendDashboard:
                 if len(date_range) == 2:
                     start_date, end_date = date_range
                     filtered_df = filtered_df[
-                        (filtered_df['date'] >= start_date.strftime('%Y-%m-%d')) &
-                        (filtered_df['date'] <= end_date.strftime('%Y-%m-%d'))
+                        filtered_df['date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))
                     ]
                     
                 st.markdown(f"**Filtered Results: {len(filtered_df)} trends**")
@@ -421,6 +560,8 @@ class TrendDashboard:
         
         # Data refresh
         if st.sidebar.button("🔄 Refresh Data"):
+            _load_trends.clear()
+            _load_demo_data.clear()
             self.load_data()
             st.success("Data refreshed!")
             
@@ -428,10 +569,12 @@ class TrendDashboard:
         st.sidebar.title("📊 Export")
         
         if st.sidebar.button("📥 Export to CSV"):
-            csv = self.trends_df.to_csv(index=False)
+            # Encode straight into a bytes buffer rather than an intermediate str
+            buffer = io.BytesIO()
+            self.trends_df.to_csv(buffer, index=False)
             st.sidebar.download_button(
                 label="Download CSV",
-                data=csv,
+                data=buffer.getvalue(),
                 file_name=f"trends_export_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
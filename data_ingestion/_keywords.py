@@ -0,0 +1,21 @@
+"""
+Keywords shared by the collectors for spotting Etsy-related content.
+"""
+
+import re
+
+# Keywords marking a pin, post or tweet as Etsy-related
+ETSY_KEYWORDS = (
+    'etsy', 'handmade', 'personalized', 'custom', 'gift',
+    'jewelry', 'necklace', 'ring', 'bracelet', 'earrings',
+    'home decor', 'wall art', 'candle', 'mug', 't-shirt',
+    'wedding', 'vintage', 'craft', 'art', 'beauty',
+    'handcrafted', 'unique', 'artisan', 'small business'
+)
+
+# Single alternation scans a text for every keyword at once
+ETSY_KEYWORD_RE = re.compile('|'.join(map(re.escape, ETSY_KEYWORDS)))
+
+# Product listings are matched without the marketplace name itself
+PRODUCT_KEYWORDS = tuple(keyword for keyword in ETSY_KEYWORDS if keyword != 'etsy')
+PRODUCT_KEYWORD_RE = re.compile('|'.join(map(re.escape, PRODUCT_KEYWORDS)))
@@ -5,17 +5,118 @@ Collects best sellers and trending products from Amazon for market insights.
 """
 
 import asyncio
+import itertools
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import aiohttp
-from bs4 import BeautifulSoup
-import re
 
 from utils.config import Config
+from ._keywords import PRODUCT_KEYWORD_RE
 
 logger = logging.getLogger(__name__)
 
+# Mock product templates; collected_at is filled in once per batch
+_MOCK_CATEGORY_PRODUCTS = {
+    'Home & Kitchen': [
+        {
+            'id': 'amz123456789',
+            'title': 'Handmade Ceramic Coffee Mug Set',
+            'description': 'Beautiful handcrafted ceramic mugs perfect for personalized gifts',
+            'category': 'Home & Kitchen',
+            'price': 24.99,
+            'rating': 4.5,
+            'review_count': 1250,
+            'collected_at': None,
+            'source': 'amazon'
+        }
+    ],
+    'Jewelry': [
+        {
+            'id': 'amz987654321',
+            'title': 'Personalized Name Necklace',
+            'description': 'Custom engraved name necklace, perfect gift for any occasion',
+            'category': 'Jewelry',
+            'price': 29.99,
+            'rating': 4.7,
+            'review_count': 890,
+            'collected_at': None,
+            'source': 'amazon'
+        }
+    ],
+    'Arts & Crafts': [
+        {
+            'id': 'amz555666777',
+            'title': 'Handmade Soap Making Kit',
+            'description': 'Complete kit for making beautiful handmade soaps at home',
+            'category': 'Arts & Crafts',
+            'price': 34.99,
+            'rating': 4.3,
+            'review_count': 567,
+            'collected_at': None,
+            'source': 'amazon'
+        }
+    ]
+}
+
+_MOCK_PRODUCTS = [
+    {
+        'id': 'amz123456789',
+        'title': 'Handmade Ceramic Coffee Mug Set',
+        'description': 'Beautiful handcrafted ceramic mugs perfect for personalized gifts. Each mug is unique and made with care.',
+        'category': 'Home & Kitchen',
+        'price': 24.99,
+        'rating': 4.5,
+        'review_count': 1250,
+        'collected_at': None,
+        'source': 'amazon'
+    },
+    {
+        'id': 'amz987654321',
+        'title': 'Personalized Name Necklace',
+        'description': 'Custom engraved name necklace, perfect gift for any occasion. Handcrafted with attention to detail.',
+        'category': 'Jewelry',
+        'price': 29.99,
+        'rating': 4.7,
+        'review_count': 890,
+        'collected_at': None,
+        'source': 'amazon'
+    },
+    {
+        'id': 'amz555666777',
+        'title': 'Handmade Soap Making Kit',
+        'description': 'Complete kit for making beautiful handmade soaps at home. Includes all materials and instructions.',
+        'category': 'Arts & Crafts',
+        'price': 34.99,
+        'rating': 4.3,
+        'review_count': 567,
+        'collected_at': None,
+        'source': 'amazon'
+    },
+    {
+        'id': 'amz111222333',
+        'title': 'Custom Wall Art Canvas',
+        'description': 'Personalized wall art canvas, perfect for home decor. Made to order with your design.',
+        'category': 'Home & Kitchen',
+        'price': 45.99,
+        'rating': 4.6,
+        'review_count': 432,
+        'collected_at': None,
+        'source': 'amazon'
+    },
+    {
+        'id': 'amz444555666',
+        'title': 'Vintage Style Jewelry Box',
+        'description': 'Beautiful vintage-style jewelry box, handcrafted with premium materials.',
+        'category': 'Jewelry',
+        'price': 39.99,
+        'rating': 4.4,
+        'review_count': 321,
+        'collected_at': None,
+        'source': 'amazon'
+    }
+]
+
 class AmazonCollector:
     """Collects Amazon best sellers and trending products."""
     
@@ -44,11 +145,22 @@ class AmazonCollector:
             
             max_products = config.get('max_products', 50)
             
-            all_products = []
+            # One collection timestamp for the whole batch
+            collected_at = datetime.now().isoformat()
+            
+            # Fetch all categories concurrently over one shared session, reusing
+            # the manager's session when one has been provided
+            if self.session is not None:
+                results = await self._gather_bestsellers(categories, max_products, collected_at)
+            else:
+                async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=10)) as session:
+                    self.session = session
+                    try:
+                        results = await self._gather_bestsellers(categories, max_products, collected_at)
+                    finally:
+                        self.session = None
             
-            for category in categories:
-                products = await self._get_category_bestsellers(category, max_products)
-                all_products.extend(products)
+            all_products = list(itertools.chain.from_iterable(results))
             
             # Remove duplicates and filter for relevance
             unique_products = self._deduplicate_products(all_products)
@@ -61,7 +173,16 @@ class AmazonCollector:
             logger.error(f"Error collecting Amazon data: {e}")
             return self._get_mock_data()
     
-    async def _get_category_bestsellers(self, category: str, max_products: int) -> List[Dict[str, Any]]:
+    async def _gather_bestsellers(self, categories: List[str], max_products: int,
+                                  collected_at: str) -> List[List[Dict[str, Any]]]:
+        """Fetch best sellers for all categories concurrently."""
+        return await asyncio.gather(*(
+            self._get_category_bestsellers(category, max_products, collected_at)
+            for category in categories
+        ))
+    
+    async def _get_category_bestsellers(self, category: str, max_products: int,
+                                        collected_at: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get best sellers for a specific category."""
         try:
             # Note: This is a simplified implementation
@@ -69,8 +190,8 @@ class AmazonCollector:
             # and use proper scraping techniques
             
             # For now, return mock data
-            return self._get_mock_products_for_category(category)
-            
+            return self._get_mock_products_for_category(category, collected_at)
+        
         except Exception as e:
             logger.error(f"Error getting best sellers for category '{category}': {e}")
             return []
@@ -90,14 +211,6 @@ class AmazonCollector:
     
     def _filter_relevant_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter products for Etsy-relevant items."""
-        etsy_keywords = [
-            'handmade', 'personalized', 'custom', 'gift',
-            'jewelry', 'necklace', 'ring', 'bracelet', 'earrings',
-            'home decor', 'wall art', 'candle', 'mug', 't-shirt',
-            'wedding', 'vintage', 'craft', 'art', 'beauty',
-            'handcrafted', 'unique', 'artisan', 'small business'
-        ]
-        
         relevant_products = []
         
         for product in products:
@@ -105,113 +218,17 @@ class AmazonCollector:
             description_lower = product.get('description', '').lower()
             
             # Check if product contains Etsy-related keywords
-            if any(keyword in title_lower or keyword in description_lower for keyword in etsy_keywords):
+            if PRODUCT_KEYWORD_RE.search(title_lower) or PRODUCT_KEYWORD_RE.search(description_lower):
                 relevant_products.append(product)
         
         return relevant_products
     
-    def _get_mock_products_for_category(self, category: str) -> List[Dict[str, Any]]:
+    def _get_mock_products_for_category(self, category: str, collected_at: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get mock products for a specific category."""
-        mock_products = {
-            'Home & Kitchen': [
-                {
-                    'id': 'amz123456789',
-                    'title': 'Handmade Ceramic Coffee Mug Set',
-                    'description': 'Beautiful handcrafted ceramic mugs perfect for personalized gifts',
-                    'category': 'Home & Kitchen',
-                    'price': 24.99,
-                    'rating': 4.5,
-                    'review_count': 1250,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'amazon'
-                }
-            ],
-            'Jewelry': [
-                {
-                    'id': 'amz987654321',
-                    'title': 'Personalized Name Necklace',
-                    'description': 'Custom engraved name necklace, perfect gift for any occasion',
-                    'category': 'Jewelry',
-                    'price': 29.99,
-                    'rating': 4.7,
-                    'review_count': 890,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'amazon'
-                }
-            ],
-            'Arts & Crafts': [
-                {
-                    'id': 'amz555666777',
-                    'title': 'Handmade Soap Making Kit',
-                    'description': 'Complete kit for making beautiful handmade soaps at home',
-                    'category': 'Arts & Crafts',
-                    'price': 34.99,
-                    'rating': 4.3,
-                    'review_count': 567,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'amazon'
-                }
-            ]
-        }
-        
-        return mock_products.get(category, [])
+        collected_at = collected_at or datetime.now().isoformat()
+        return [{**product, 'collected_at': collected_at} for product in _MOCK_CATEGORY_PRODUCTS.get(category, [])]
     
     def _get_mock_data(self) -> List[Dict[str, Any]]:
         """Return mock Amazon data for testing."""
-        return [
-            {
-                'id': 'amz123456789',
-                'title': 'Handmade Ceramic Coffee Mug Set',
-                'description': 'Beautiful handcrafted ceramic mugs perfect for personalized gifts. Each mug is unique and made with care.',
-                'category': 'Home & Kitchen',
-                'price': 24.99,
-                'rating': 4.5,
-                'review_count': 1250,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'amazon'
-            },
-            {
-                'id': 'amz987654321',
-                'title': 'Personalized Name Necklace',
-                'description': 'Custom engraved name necklace, perfect gift for any occasion. Handcrafted with attention to detail.',
-                'category': 'Jewelry',
-                'price': 29.99,
-                'rating': 4.7,
-                'review_count': 890,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'amazon'
-            },
-            {
-                'id': 'amz555666777',
-                'title': 'Handmade Soap Making Kit',
-                'description': 'Complete kit for making beautiful handmade soaps at home. Includes all materials and instructions.',
-                'category': 'Arts & Crafts',
-                'price': 34.99,
-                'rating': 4.3,
-                'review_count': 567,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'amazon'
-            },
-            {
-                'id': 'amz111222333',
-                'title': 'Custom Wall Art Canvas',
-                'description': 'Personalized wall art canvas, perfect for home decor. Made to order with your design.',
-                'category': 'Home & Kitchen',
-                'price': 45.99,
-                'rating': 4.6,
-                'review_count': 432,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'amazon'
-            },
-            {
-                'id': 'amz444555666',
-                'title': 'Vintage Style Jewelry Box',
-                'description': 'Beautiful vintage-style jewelry box, handcrafted with premium materials.',
-                'category': 'Jewelry',
-                'price': 39.99,
-                'rating': 4.4,
-                'review_count': 321,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'amazon'
-            }
-        ] 
\ No newline at end of file
+        collected_at = datetime.now().isoformat()
+        return [{**product, 'collected_at': collected_at} for product in _MOCK_PRODUCTS]
\ No newline at end of file
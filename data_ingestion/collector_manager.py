@@ -5,9 +5,9 @@ Data Collector Manager - Coordinates data collection from multiple sources.
 import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable, Callable
 from pathlib import Path
-import json
+import aiohttp
 
 from .google_trends_collector import GoogleTrendsCollector
 from .reddit_collector import RedditCollector
@@ -15,11 +15,18 @@ from .pinterest_collector import PinterestCollector
 from .twitter_collector import TwitterCollector
 from .amazon_collector import AmazonCollector
 from .etsy_collector import EtsyCollector
+from utils import fastjson
 from utils.config import Config
 from utils.database import Database
 
 logger = logging.getLogger(__name__)
 
+# Rows written per database transaction
+INSERT_BATCH_SIZE = 1000
+
+# Batches buffered between collectors and the database writer
+WRITE_QUEUE_SIZE = 4
+
 class DataCollectorManager:
     """Manages data collection from multiple sources."""
     
@@ -36,6 +43,13 @@ class DataCollectorManager:
             'amazon': AmazonCollector(config),
             'etsy': EtsyCollector(config)
         }
+        
+        # Resolve each collector's entry point once
+        self._collect_fns: Dict[str, Callable[..., Awaitable[List[Dict[str, Any]]]]] = {
+            source: collector.collect_data
+            for source, collector in self.collectors.items()
+            if hasattr(collector, 'collect_data')
+        }
     
     async def collect_all_data(self, sources: List[str], mode: str = 'daily') -> Dict[str, Any]:
         """
@@ -48,108 +62,149 @@ class DataCollectorManager:
         Returns:
             Dictionary containing collected data from all sources
         """
-        logger.info(f"Starting data collection for sources: {sources}")
+        logger.info("Starting data collection for sources: %s", sources)
         
-        # Filter enabled sources
-        enabled_sources = [s for s in sources if self.config.is_source_enabled(s)]
+        # Filter enabled sources that have a collector
+        enabled_sources = [s for s in sources if s in self.collectors and self.config.is_source_enabled(s)]
         
         if not enabled_sources:
             logger.warning("No enabled data sources found")
             return {}
         
+        # Collectors hand finished batches to a single database writer, so
+        # saving starts with the first source instead of the slowest one
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        writer = asyncio.create_task(self._save_to_database(write_queue))
+        
         # Collect data from each source
-        collection_tasks = []
-        for source in enabled_sources:
-            if source in self.collectors:
-                task = self._collect_from_source(source, mode)
-                collection_tasks.append(task)
+        collection_tasks = [self._collect_from_source(source, mode, write_queue) for source in enabled_sources]
         
-        # Run all collection tasks concurrently
-        results = await asyncio.gather(*collection_tasks, return_exceptions=True)
+        # Run all collection tasks concurrently over one pooled HTTP session
+        try:
+            async with self._http_session() as session:
+                http_collectors = [c for c in self.collectors.values() if hasattr(c, 'session')]
+                for collector in http_collectors:
+                    collector.session = session
+                try:
+                    results = await asyncio.gather(*collection_tasks, return_exceptions=True)
+                finally:
+                    for collector in http_collectors:
+                        collector.session = None
+        finally:
+            await write_queue.put(None)
+            await writer
         
         # Process results
         collected_data = {}
-        for i, source in enumerate(enabled_sources):
-            result = results[i]
+        total_items = 0
+        for source, result in zip(enabled_sources, results):
             if isinstance(result, Exception):
-                logger.error(f"Error collecting from {source}: {result}")
+                logger.error("Error collecting from %s: %s", source, result)
                 collected_data[source] = []
             else:
                 collected_data[source] = result
-                logger.info(f"Collected {len(result)} items from {source}")
+                total_items += len(result)
+                logger.info("Collected %d items from %s", len(result), source)
         
         # Add metadata
         collected_data['metadata'] = {
             'collection_time': datetime.now().isoformat(),
             'mode': mode,
             'sources': enabled_sources,
-            'total_items': sum(len(data) for data in collected_data.values() if isinstance(data, list))
+            'total_items': total_items
         }
         
-        # Save to database
-        await self._save_to_database(collected_data)
-        
-        # Save raw data to file
-        self._save_raw_data(collected_data, mode)
+        # Save raw data to file; encoding a large dump is CPU-bound, so keep it
+        # off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._save_raw_data, collected_data, mode)
         
-        logger.info(f"Data collection completed. Total items: {collected_data['metadata']['total_items']}")
+        logger.info("Data collection completed. Total items: %d", total_items)
         
         return collected_data
     
-    async def _collect_from_source(self, source: str, mode: str) -> List[Dict[str, Any]]:
-        """Collect data from a specific source."""
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session shared by collectors during a collection run."""
+        # Sessions are bound to the running event loop, so one is opened per run
+        # rather than held on the manager across asyncio.run calls
+        connector = aiohttp.TCPConnector(limit_per_host=10, ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector)
+    
+    async def _collect_from_source(self, source: str, mode: str,
+                                   write_queue: Optional[asyncio.Queue] = None) -> List[Dict[str, Any]]:
+        """Collect data from a specific source, queueing it for the database writer."""
+        collect_fn = self._collect_fns.get(source)
+        if collect_fn is None:
+            logger.warning("Collector %s does not have collect_data method", source)
+            return []
+        
         try:
-            collector = self.collectors[source]
             source_config = self.config.get_source_config(source)
             
-            logger.info(f"Collecting data from {source}")
-            
-            if hasattr(collector, 'collect_data'):
-                data = await collector.collect_data(mode, source_config)
-            else:
-                logger.warning(f"Collector {source} does not have collect_data method")
-                data = []
-            
-            return data
+            logger.info("Collecting data from %s", source)
             
+            data = await collect_fn(mode, source_config)
+        
         except Exception as e:
-            logger.error(f"Error collecting from {source}: {e}")
+            logger.error("Error collecting from %s: %s", source, e)
             return []
+        
+        if write_queue is not None and isinstance(data, list):
+            for start in range(0, len(data), INSERT_BATCH_SIZE):
+                await write_queue.put((source, data[start:start + INSERT_BATCH_SIZE]))
+        
+        return data
     
-    async def _save_to_database(self, data: Dict[str, Any]):
-        """Save collected data to database."""
-        try:
-            for source, items in data.items():
-                if source == 'metadata':
-                    continue
-                
-                if isinstance(items, list):
-                    for item in items:
-                        item['source'] = source
-                        item['collected_at'] = datetime.now().isoformat()
-                        await self.db.insert_trend_data(item)
+    async def _save_to_database(self, write_queue: asyncio.Queue):
+        """Save batches of collected items to the database until a None sentinel arrives."""
+        now_iso = datetime.now().isoformat()
+        
+        while True:
+            batch = await write_queue.get()
+            if batch is None:
+                break
             
-            logger.info("Data saved to database")
+            # Keep draining on errors so collectors never block on a full queue
+            try:
+                source, items = batch
+                # Collectors already stamp their own records; only fill gaps so
+                # their collection times are preserved
+                for item in items:
+                    item.setdefault('source', source)
+                    item.setdefault('collected_at', now_iso)
+                
+                await self.db.insert_trend_data_many(items)
             
-        except Exception as e:
-            logger.error(f"Error saving to database: {e}")
+            except Exception as e:
+                logger.error("Error saving to database: %s", e)
+        
+        logger.info("Data saved to database")
     
     def _save_raw_data(self, data: Dict[str, Any], mode: str):
-        """Save raw data to file."""
+        """Save raw data to a JSON Lines file, one collected item per line."""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data/raw/collected_data_{mode}_{timestamp}.json"
+            filename = f"data/raw/collected_data_{mode}_{timestamp}.jsonl"
             
             filepath = Path(filename)
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Items are encoded and written one at a time, so no single
+            # serialized copy of the whole run is held in memory
+            with open(filepath, 'wb') as f:
+                for source, items in data.items():
+                    if source == 'metadata' or not isinstance(items, list):
+                        continue
+                    
+                    for item in items:
+                        f.write(fastjson.dumps(item, newline=True))
+                
+                f.write(fastjson.dumps({'metadata': data.get('metadata', {})}, newline=True))
             
-            logger.info(f"Raw data saved to {filepath}")
+            logger.info("Raw data saved to %s", filepath)
             
         except Exception as e:
-            logger.error(f"Error saving raw data: {e}")
+            logger.error("Error saving raw data: %s", e)
     
     async def get_recent_data(self, hours: int = 24) -> Dict[str, Any]:
         """Get recent data from database."""
@@ -157,16 +212,16 @@ class DataCollectorManager:
             recent_data = await self.db.get_recent_data(hours)
             return recent_data
         except Exception as e:
-            logger.error(f"Error getting recent data: {e}")
+            logger.error("Error getting recent data: %s", e)
             return {}
     
     async def cleanup_old_data(self, days: int = 7):
         """Clean up old data from database."""
         try:
             await self.db.cleanup_old_data(days)
-            logger.info(f"Cleaned up data older than {days} days")
+            logger.info("Cleaned up data older than %s days", days)
         except Exception as e:
-            logger.error(f"Error cleaning up old data: {e}")
+            logger.error("Error cleaning up old data: %s", e)
     
     def get_collector_status(self) -> Dict[str, bool]:
         """Get status of all collectors."""
@@ -174,6 +229,6 @@ class DataCollectorManager:
         for source, collector in self.collectors.items():
             status[source] = {
                 'enabled': self.config.is_source_enabled(source),
-                'available': hasattr(collector, 'collect_data')
+                'available': source in self._collect_fns
             }
         return status 
\ No newline at end of file
@@ -9,13 +9,129 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import aiohttp
-from bs4 import BeautifulSoup
 import json
 
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Mock product templates; collected_at is filled in per call
+_MOCK_CATEGORY_PRODUCTS = {
+    'jewelry': [
+        {
+            'id': 'etsy123456789',
+            'title': 'Personalized Name Necklace',
+            'description': 'Beautiful custom name necklace, perfect gift for any occasion',
+            'category': 'jewelry',
+            'price': 25.99,
+            'currency': 'USD',
+            'shop_name': 'JewelryCraft',
+            'views': 1500,
+            'favorers': 45,
+            'collected_at': None,
+            'source': 'etsy'
+        }
+    ],
+    'home-decor': [
+        {
+            'id': 'etsy987654321',
+            'title': 'Handmade Ceramic Mug',
+            'description': 'Beautiful handcrafted ceramic mug, perfect for coffee or tea',
+            'category': 'home-decor',
+            'price': 18.50,
+            'currency': 'USD',
+            'shop_name': 'PotteryStudio',
+            'views': 2200,
+            'favorers': 67,
+            'collected_at': None,
+            'source': 'etsy'
+        }
+    ],
+    'clothing': [
+        {
+            'id': 'etsy555666777',
+            'title': 'Custom T-Shirt Design',
+            'description': 'Personalized t-shirt with your custom design, made to order',
+            'category': 'clothing',
+            'price': 22.00,
+            'currency': 'USD',
+            'shop_name': 'TeeDesigns',
+            'views': 1800,
+            'favorers': 52,
+            'collected_at': None,
+            'source': 'etsy'
+        }
+    ]
+}
+
+_MOCK_PRODUCTS = [
+    {
+        'id': 'etsy123456789',
+        'title': 'Personalized Name Necklace',
+        'description': 'Beautiful custom name necklace, perfect gift for any occasion. Handcrafted with attention to detail.',
+        'category': 'jewelry',
+        'price': 25.99,
+        'currency': 'USD',
+        'shop_name': 'JewelryCraft',
+        'views': 1500,
+        'favorers': 45,
+        'collected_at': None,
+        'source': 'etsy'
+    },
+    {
+        'id': 'etsy987654321',
+        'title': 'Handmade Ceramic Mug',
+        'description': 'Beautiful handcrafted ceramic mug, perfect for coffee or tea. Each piece is unique.',
+        'category': 'home-decor',
+        'price': 18.50,
+        'currency': 'USD',
+        'shop_name': 'PotteryStudio',
+        'views': 2200,
+        'favorers': 67,
+        'collected_at': None,
+        'source': 'etsy'
+    },
+    {
+        'id': 'etsy555666777',
+        'title': 'Custom T-Shirt Design',
+        'description': 'Personalized t-shirt with your custom design, made to order. High quality materials.',
+        'category': 'clothing',
+        'price': 22.00,
+        'currency': 'USD',
+        'shop_name': 'TeeDesigns',
+        'views': 1800,
+        'favorers': 52,
+        'collected_at': None,
+        'source': 'etsy'
+    },
+    {
+        'id': 'etsy111222333',
+        'title': 'Handmade Soap Bar Set',
+        'description': 'Natural handmade soap bars with amazing scents. Perfect for gifts or personal use.',
+        'category': 'beauty',
+        'price': 15.99,
+        'currency': 'USD',
+        'shop_name': 'SoapCraft',
+        'views': 1200,
+        'favorers': 38,
+        'collected_at': None,
+        'source': 'etsy'
+    },
+    {
+        'id': 'etsy444555666',
+        'title': 'Vintage Style Wall Art',
+        'description': 'Beautiful vintage-style wall art, perfect for home decor. Handcrafted and unique.',
+        'category': 'home-decor',
+        'price': 35.00,
+        'currency': 'USD',
+        'shop_name': 'VintageArt',
+        'views': 950,
+        'favorers': 29,
+        'collected_at': None,
+        'source': 'etsy'
+    }
+]
+
 class EtsyCollector:
     """Collects Etsy search suggestions and trending products."""
     
@@ -89,122 +205,10 @@ class EtsyCollector:
     
     def _get_mock_products_for_category(self, category: str) -> List[Dict[str, Any]]:
         """Get mock products for a specific category."""
-        mock_products = {
-            'jewelry': [
-                {
-                    'id': 'etsy123456789',
-                    'title': 'Personalized Name Necklace',
-                    'description': 'Beautiful custom name necklace, perfect gift for any occasion',
-                    'category': 'jewelry',
-                    'price': 25.99,
-                    'currency': 'USD',
-                    'shop_name': 'JewelryCraft',
-                    'views': 1500,
-                    'favorers': 45,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'etsy'
-                }
-            ],
-            'home-decor': [
-                {
-                    'id': 'etsy987654321',
-                    'title': 'Handmade Ceramic Mug',
-                    'description': 'Beautiful handcrafted ceramic mug, perfect for coffee or tea',
-                    'category': 'home-decor',
-                    'price': 18.50,
-                    'currency': 'USD',
-                    'shop_name': 'PotteryStudio',
-                    'views': 2200,
-                    'favorers': 67,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'etsy'
-                }
-            ],
-            'clothing': [
-                {
-                    'id': 'etsy555666777',
-                    'title': 'Custom T-Shirt Design',
-                    'description': 'Personalized t-shirt with your custom design, made to order',
-                    'category': 'clothing',
-                    'price': 22.00,
-                    'currency': 'USD',
-                    'shop_name': 'TeeDesigns',
-                    'views': 1800,
-                    'favorers': 52,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'etsy'
-                }
-            ]
-        }
-        
-        return mock_products.get(category, [])
+        collected_at = datetime.now().isoformat()
+        return [{**product, 'collected_at': collected_at} for product in _MOCK_CATEGORY_PRODUCTS.get(category, [])]
     
     def _get_mock_data(self) -> List[Dict[str, Any]]:
         """Return mock Etsy data for testing."""
-        return [
-            {
-                'id': 'etsy123456789',
-                'title': 'Personalized Name Necklace',
-                'description': 'Beautiful custom name necklace, perfect gift for any occasion. Handcrafted with attention to detail.',
-                'category': 'jewelry',
-                'price': 25.99,
-                'currency': 'USD',
-                'shop_name': 'JewelryCraft',
-                'views': 1500,
-                'favorers': 45,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'etsy'
-            },
-            {
-                'id': 'etsy987654321',
-                'title': 'Handmade Ceramic Mug',
-                'description': 'Beautiful handcrafted ceramic mug, perfect for coffee or tea. Each piece is unique.',
-                'category': 'home-decor',
-                'price': 18.50,
-                'currency': 'USD',
-                'shop_name': 'PotteryStudio',
-                'views': 2200,
-                'favorers': 67,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'etsy'
-            },
-            {
-                'id': 'etsy555666777',
-                'title': 'Custom T-Shirt Design',
-                'description': 'Personalized t-shirt with your custom design, made to order. High quality materials.',
-                'category': 'clothing',
-                'price': 22.00,
-                'currency': 'USD',
-                'shop_name': 'TeeDesigns',
-                'views': 1800,
-                'favorers': 52,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'etsy'
-            },
-            {
-                'id': 'etsy111222333',
-                'title': 'Handmade Soap Bar Set',
-                'description': 'Natural handmade soap bars with amazing scents. Perfect for gifts or personal use.',
-                'category': 'beauty',
-                'price': 15.99,
-                'currency': 'USD',
-                'shop_name': 'SoapCraft',
-                'views': 1200,
-                'favorers': 38,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'etsy'
-            },
-            {
-                'id': 'etsy444555666',
-                'title': 'Vintage Style Wall Art',
-                'description': 'Beautiful vintage-style wall art, perfect for home decor. Handcrafted and unique.',
-                'category': 'home-decor',
-                'price': 35.00,
-                'currency': 'USD',
-                'shop_name': 'VintageArt',
-                'views': 950,
-                'favorers': 29,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'etsy'
-            }
-        ] 
\ No newline at end of file
+        collected_at = datetime.now().isoformat()
+        return [{**product, 'collected_at': collected_at} for product in _MOCK_PRODUCTS] 
\ No newline at end of file
@@ -5,16 +5,104 @@ Collects trending search data from Google Trends using pytrends library.
 """
 
 import asyncio
+import functools
+import itertools
 import logging
+import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import pandas as pd
+import numpy as np
 from pytrends.request import TrendReq
 
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Keywords marking a trending search as Etsy-related
+RISING_SEARCH_KEYWORDS = ('gift', 'jewelry', 'handmade', 'personalized', 'craft', 'art', 'decor')
+
+# Rising searches come back in mixed case, so match case-insensitively
+_RISING_KEYWORD_RE = re.compile('|'.join(map(re.escape, RISING_SEARCH_KEYWORDS)), re.IGNORECASE)
+
+# Mock trend templates; collected_at is filled in per call
+_MOCK_TRENDS = [
+    {
+        'search_term': 'etsy jewelry',
+        'recent_interest': 75.5,
+        'trend_direction': 'rising',
+        'growth_rate': 12.5,
+        'interest_over_time': {
+            '2024-01-01': 65,
+            '2024-01-02': 68,
+            '2024-01-03': 72,
+            '2024-01-04': 75,
+            '2024-01-05': 78
+        },
+        'top_queries': [
+            {'query': 'personalized jewelry', 'value': 100},
+            {'query': 'handmade jewelry', 'value': 85},
+            {'query': 'etsy necklaces', 'value': 70}
+        ],
+        'rising_queries': [
+            {'query': 'custom jewelry', 'value': 150},
+            {'query': 'etsy rings', 'value': 120}
+        ],
+        'related_topics': {},
+        'collected_at': None,
+        'source': 'google_trends'
+    },
+    {
+        'search_term': 'etsy home decor',
+        'recent_interest': 62.3,
+        'trend_direction': 'stable',
+        'growth_rate': 2.1,
+        'interest_over_time': {
+            '2024-01-01': 60,
+            '2024-01-02': 62,
+            '2024-01-03': 61,
+            '2024-01-04': 63,
+            '2024-01-05': 62
+        },
+        'top_queries': [
+            {'query': 'wall art', 'value': 90},
+            {'query': 'home accessories', 'value': 75},
+            {'query': 'decorative items', 'value': 65}
+        ],
+        'rising_queries': [
+            {'query': 'minimalist decor', 'value': 130},
+            {'query': 'boho home decor', 'value': 110}
+        ],
+        'related_topics': {},
+        'collected_at': None,
+        'source': 'google_trends'
+    },
+    {
+        'search_term': 'etsy personalized gifts',
+        'recent_interest': 88.7,
+        'trend_direction': 'rising',
+        'growth_rate': 18.3,
+        'interest_over_time': {
+            '2024-01-01': 80,
+            '2024-01-02': 82,
+            '2024-01-03': 85,
+            '2024-01-04': 87,
+            '2024-01-05': 89
+        },
+        'top_queries': [
+            {'query': 'custom gifts', 'value': 95},
+            {'query': 'personalized items', 'value': 88},
+            {'query': 'unique gifts', 'value': 82}
+        ],
+        'rising_queries': [
+            {'query': 'engraved gifts', 'value': 160},
+            {'query': 'monogrammed items', 'value': 140}
+        ],
+        'related_topics': {},
+        'collected_at': None,
+        'source': 'google_trends'
+    }
+]
+
 class GoogleTrendsCollector:
     """Collects trending search data from Google Trends."""
     
@@ -48,48 +136,52 @@ class GoogleTrendsCollector:
         logger.info("Starting Google Trends data collection")
         
         try:
-            all_trends = []
+            # Query search terms concurrently, capped to stay under rate limits
+            max_concurrency = config.get('max_concurrency', 8) if config else 8
+            semaphore = asyncio.Semaphore(max_concurrency)
             
-            # Collect data for each search term
-            for term in self.search_terms:
-                trend_data = await self._get_trend_data(term, mode, config)
-                if trend_data:
-                    all_trends.append(trend_data)
+            async def fetch(term: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._get_trend_data(term, mode, config)
             
-            logger.info(f"Collected {len(all_trends)} Google Trends records")
+            results = await asyncio.gather(*(fetch(term) for term in self.search_terms))
+            all_trends = [trend_data for trend_data in results if trend_data]
+            
+            logger.info("Collected %d Google Trends records", len(all_trends))
             return all_trends
             
         except Exception as e:
-            logger.error(f"Error collecting Google Trends data: {e}")
+            logger.error("Error collecting Google Trends data: %s", e)
             return self._get_mock_data()
     
     async def _get_trend_data(self, search_term: str, mode: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get trend data for a specific search term."""
         try:
-            # Build payload
-            self.pytrends.build_payload(
-                [search_term], 
-                cat=0, 
-                timeframe=config.get('timeframe', 'today 3-m') if config else 'today 3-m',
-                geo=config.get('geo', 'US') if config else 'US'
-            )
+            timeframe = config.get('timeframe', 'today 3-m') if config else 'today 3-m'
+            geo = config.get('geo', 'US') if config else 'US'
             
-            # Get interest over time
-            interest_over_time = self.pytrends.interest_over_time()
+            # pytrends blocks on HTTP, so run it off the event loop
+            loop = asyncio.get_running_loop()
+            fetched = await loop.run_in_executor(
+                None, self._fetch_pytrends, search_term, timeframe, geo
+            )
             
-            if interest_over_time.empty:
+            if fetched is None:
                 return None
             
-            # Get related queries
-            related_queries = self.pytrends.related_queries()
+            interest_over_time, related_queries, related_topics = fetched
             
-            # Get related topics
-            related_topics = self.pytrends.related_topics()
+            # Calculate trend metrics on the raw values; slicing a short
+            # array is far cheaper than pandas head/tail
+            interest_series = interest_over_time[search_term]
+            values = interest_series.to_numpy(dtype=np.float64)
+            recent_interest = values[-7:].mean()
+            trend_direction = self._calculate_trend_direction(values)
+            growth_rate = self._calculate_growth_rate(values)
             
-            # Calculate trend metrics
-            recent_interest = interest_over_time[search_term].tail(7).mean()
-            trend_direction = self._calculate_trend_direction(interest_over_time[search_term])
-            growth_rate = self._calculate_growth_rate(interest_over_time[search_term])
+            # Format the last 30 dates in one vectorized call; string keys also
+            # keep the record JSON-serializable
+            recent_dates = interest_series.index[-30:].astype(str)
             
             # Process related queries
             top_queries = []
@@ -107,7 +199,7 @@ class GoogleTrendsCollector:
                 'recent_interest': float(recent_interest),
                 'trend_direction': trend_direction,
                 'growth_rate': growth_rate,
-                'interest_over_time': interest_over_time[search_term].tail(30).to_dict(),
+                'interest_over_time': dict(zip(recent_dates, interest_series.tolist()[-30:])),
                 'top_queries': top_queries,
                 'rising_queries': rising_queries,
                 'related_topics': related_topics.get(search_term, {}),
@@ -118,16 +210,34 @@ class GoogleTrendsCollector:
             return trend_data
             
         except Exception as e:
-            logger.error(f"Error getting trend data for '{search_term}': {e}")
+            logger.error("Error getting trend data for '%s': %s", search_term, e)
             return None
     
-    def _calculate_trend_direction(self, interest_series: pd.Series) -> str:
+    def _fetch_pytrends(self, search_term: str, timeframe: str, geo: str) -> Optional[tuple]:
+        """Fetch interest over time, related queries and related topics for a term."""
+        # TrendReq keeps the current payload on the instance, so concurrent
+        # terms each need their own
+        pytrends = TrendReq(hl='en-US', tz=360)
+        
+        # Build payload
+        pytrends.build_payload([search_term], cat=0, timeframe=timeframe, geo=geo)
+        
+        # Get interest over time
+        interest_over_time = pytrends.interest_over_time()
+        
+        if interest_over_time.empty:
+            return None
+        
+        # Get related queries and topics
+        return interest_over_time, pytrends.related_queries(), pytrends.related_topics()
+    
+    def _calculate_trend_direction(self, interest_values: np.ndarray) -> str:
         """Calculate if trend is rising, falling, or stable."""
-        if len(interest_series) < 14:
+        if len(interest_values) < 14:
             return "stable"
         
-        recent_avg = interest_series.tail(7).mean()
-        older_avg = interest_series.head(7).mean()
+        recent_avg = float(interest_values[-7:].mean())
+        older_avg = float(interest_values[:7].mean())
         
         if recent_avg > older_avg * 1.1:
             return "rising"
@@ -136,13 +246,13 @@ class GoogleTrendsCollector:
         else:
             return "stable"
     
-    def _calculate_growth_rate(self, interest_series: pd.Series) -> float:
+    def _calculate_growth_rate(self, interest_values: np.ndarray) -> float:
         """Calculate growth rate over the last 30 days."""
-        if len(interest_series) < 30:
+        if len(interest_values) < 30:
             return 0.0
         
-        recent_avg = interest_series.tail(7).mean()
-        older_avg = interest_series.head(7).mean()
+        recent_avg = float(interest_values[-7:].mean())
+        older_avg = float(interest_values[:7].mean())
         
         if older_avg == 0:
             return 0.0
@@ -153,98 +263,20 @@ class GoogleTrendsCollector:
         """Get currently rising searches related to Etsy."""
         try:
             # Get real-time trending searches
-            trending_searches = self.pytrends.trending_searches(pn='united_states')
-            
-            # Filter for Etsy-related terms
-            etsy_related = []
-            etsy_keywords = ['gift', 'jewelry', 'handmade', 'personalized', 'craft', 'art', 'decor']
-            
-            for term in trending_searches[0]:
-                if any(keyword in term.lower() for keyword in etsy_keywords):
-                    etsy_related.append(term)
-            
-            return etsy_related[:10]  # Return top 10
+            loop = asyncio.get_running_loop()
+            trending_searches = await loop.run_in_executor(
+                None, functools.partial(self.pytrends.trending_searches, pn='united_states')
+            )
             
+            # Filter for Etsy-related terms, stopping at the top 10
+            etsy_related = (term for term in trending_searches[0] if _RISING_KEYWORD_RE.search(term))
+            return list(itertools.islice(etsy_related, 10))
+        
         except Exception as e:
-            logger.error(f"Error getting rising searches: {e}")
+            logger.error("Error getting rising searches: %s", e)
             return []
     
     def _get_mock_data(self) -> List[Dict[str, Any]]:
         """Return mock Google Trends data for testing."""
-        return [
-            {
-                'search_term': 'etsy jewelry',
-                'recent_interest': 75.5,
-                'trend_direction': 'rising',
-                'growth_rate': 12.5,
-                'interest_over_time': {
-                    '2024-01-01': 65,
-                    '2024-01-02': 68,
-                    '2024-01-03': 72,
-                    '2024-01-04': 75,
-                    '2024-01-05': 78
-                },
-                'top_queries': [
-                    {'query': 'personalized jewelry', 'value': 100},
-                    {'query': 'handmade jewelry', 'value': 85},
-                    {'query': 'etsy necklaces', 'value': 70}
-                ],
-                'rising_queries': [
-                    {'query': 'custom jewelry', 'value': 150},
-                    {'query': 'etsy rings', 'value': 120}
-                ],
-                'related_topics': {},
-                'collected_at': datetime.now().isoformat(),
-                'source': 'google_trends'
-            },
-            {
-                'search_term': 'etsy home decor',
-                'recent_interest': 62.3,
-                'trend_direction': 'stable',
-                'growth_rate': 2.1,
-                'interest_over_time': {
-                    '2024-01-01': 60,
-                    '2024-01-02': 62,
-                    '2024-01-03': 61,
-                    '2024-01-04': 63,
-                    '2024-01-05': 62
-                },
-                'top_queries': [
-                    {'query': 'wall art', 'value': 90},
-                    {'query': 'home accessories', 'value': 75},
-                    {'query': 'decorative items', 'value': 65}
-                ],
-                'rising_queries': [
-                    {'query': 'minimalist decor', 'value': 130},
-                    {'query': 'boho home decor', 'value': 110}
-                ],
-                'related_topics': {},
-                'collected_at': datetime.now().isoformat(),
-                'source': 'google_trends'
-            },
-            {
-                'search_term': 'etsy personalized gifts',
-                'recent_interest': 88.7,
-                'trend_direction': 'rising',
-                'growth_rate': 18.3,
-                'interest_over_time': {
-                    '2024-01-01': 80,
-                    '2024-01-02': 82,
-                    '2024-01-03': 85,
-                    '2024-01-04': 87,
-                    '2024-01-05': 89
-                },
-                'top_queries': [
-                    {'query': 'custom gifts', 'value': 95},
-                    {'query': 'personalized items', 'value': 88},
-                    {'query': 'unique gifts', 'value': 82}
-                ],
-                'rising_queries': [
-                    {'query': 'engraved gifts', 'value': 160},
-                    {'query': 'monogrammed items', 'value': 140}
-                ],
-                'related_topics': {},
-                'collected_at': datetime.now().isoformat(),
-                'source': 'google_trends'
-            }
-        ] 
\ No newline at end of file
+        collected_at = datetime.now().isoformat()
+        return [{**trend, 'collected_at': collected_at} for trend in _MOCK_TRENDS] 
\ No newline at end of file
@@ -5,6 +5,7 @@ Collects trending searches and pins related to Etsy products from Pinterest.
 """
 
 import asyncio
+import itertools
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -13,9 +14,71 @@ from bs4 import BeautifulSoup
 import json
 
 from utils.config import Config
+from ._keywords import ETSY_KEYWORD_RE
 
 logger = logging.getLogger(__name__)
 
+# Mock templates; collected_at is filled in per call
+_MOCK_QUERY_PINS = {
+    'etsy jewelry': [
+        {
+            'id': 'pin123456789',
+            'title': 'Beautiful Handmade Jewelry from Etsy',
+            'description': 'Stunning personalized name necklace found on Etsy. The craftsmanship is incredible!',
+            'note': 'Love this handmade necklace! #Etsy #Handmade #Jewelry',
+            'collected_at': None,
+            'source': 'pinterest'
+        }
+    ],
+    'etsy home decor': [
+        {
+            'id': 'pin987654321',
+            'title': 'Etsy Home Decor Finds',
+            'description': 'Amazing handmade home decor items from Etsy sellers. Everything is so unique!',
+            'note': 'Perfect for my living room! #HomeDecor #Etsy #Handmade',
+            'collected_at': None,
+            'source': 'pinterest'
+        }
+    ],
+    'etsy gifts': [
+        {
+            'id': 'pin555666777',
+            'title': 'Wedding Gifts from Etsy',
+            'description': 'Found the perfect personalized wedding gifts on Etsy. Handmade ceramic mugs with our initials.',
+            'note': 'Love these personalized gifts! #Wedding #Etsy #Personalized',
+            'collected_at': None,
+            'source': 'pinterest'
+        }
+    ]
+}
+
+_MOCK_PINS = [
+    {
+        'id': 'pin123456789',
+        'title': 'Beautiful Handmade Jewelry from Etsy',
+        'description': 'Stunning personalized name necklace found on Etsy. The craftsmanship is incredible and the seller was so helpful!',
+        'note': 'Love this handmade necklace! #Etsy #Handmade #Jewelry',
+        'collected_at': None,
+        'source': 'pinterest'
+    },
+    {
+        'id': 'pin987654321',
+        'title': 'Etsy Home Decor Finds',
+        'description': 'Amazing handmade home decor items from Etsy sellers. Everything is so unique and beautiful!',
+        'note': 'Perfect for my living room! #HomeDecor #Etsy #Handmade',
+        'collected_at': None,
+        'source': 'pinterest'
+    },
+    {
+        'id': 'pin555666777',
+        'title': 'Wedding Gifts from Etsy',
+        'description': 'Found the perfect personalized wedding gifts on Etsy. Handmade ceramic mugs with our initials.',
+        'note': 'Love these personalized gifts! #Wedding #Etsy #Personalized',
+        'collected_at': None,
+        'source': 'pinterest'
+    }
+]
+
 class PinterestCollector:
     """Collects Pinterest pins and trending searches related to Etsy products."""
     
@@ -44,11 +107,21 @@ class PinterestCollector:
             
             max_pins = config.get('max_pins', 100)
             
-            all_pins = []
+            max_concurrency = config.get('max_concurrency', 10)
+            
+            # Reuse the manager's pooled session when one has been provided
+            if self.session is not None:
+                results = await self._search_all_pins(search_terms, max_pins, max_concurrency)
+            else:
+                connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
+                async with aiohttp.ClientSession(connector=connector) as session:
+                    self.session = session
+                    try:
+                        results = await self._search_all_pins(search_terms, max_pins, max_concurrency)
+                    finally:
+                        self.session = None
             
-            for term in search_terms:
-                pins = await self._search_pins(term, max_pins)
-                all_pins.extend(pins)
+            all_pins = list(itertools.chain.from_iterable(results))
             
             # Remove duplicates and filter for relevance
             unique_pins = self._deduplicate_pins(all_pins)
@@ -61,6 +134,17 @@ class PinterestCollector:
             logger.error(f"Error collecting Pinterest data: {e}")
             return self._get_mock_data()
     
+    async def _search_all_pins(self, search_terms: List[str], max_pins: int,
+                               max_concurrency: int) -> List[List[Dict[str, Any]]]:
+        """Search all terms concurrently, capped to stay under rate limits."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def search(term: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._search_pins(term, max_pins)
+        
+        return await asyncio.gather(*(search(term) for term in search_terms))
+    
     async def _search_pins(self, query: str, max_pins: int) -> List[Dict[str, Any]]:
         """Search for pins using Pinterest."""
         try:
@@ -90,90 +174,25 @@ class PinterestCollector:
     
     def _filter_relevant_pins(self, pins: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter pins for Etsy-related content."""
-        etsy_keywords = [
-            'etsy', 'handmade', 'personalized', 'custom', 'gift',
-            'jewelry', 'necklace', 'ring', 'bracelet', 'earrings',
-            'home decor', 'wall art', 'candle', 'mug', 't-shirt',
-            'wedding', 'vintage', 'craft', 'art', 'beauty',
-            'handcrafted', 'unique', 'artisan', 'small business'
-        ]
-        
         relevant_pins = []
+        search = ETSY_KEYWORD_RE.search
         
         for pin in pins:
-            title_lower = pin.get('title', '').lower()
-            description_lower = pin.get('description', '').lower()
-            note_lower = pin.get('note', '').lower()
-            
-            # Check if pin contains Etsy-related keywords
-            if any(keyword in title_lower or keyword in description_lower or keyword in note_lower 
-                   for keyword in etsy_keywords):
+            # Check if pin contains Etsy-related keywords, lowercasing each
+            # field only when the earlier ones had no match
+            if (search(pin.get('title', '').lower())
+                    or search(pin.get('description', '').lower())
+                    or search(pin.get('note', '').lower())):
                 relevant_pins.append(pin)
         
         return relevant_pins
     
     def _get_mock_pins_for_query(self, query: str) -> List[Dict[str, Any]]:
         """Get mock pins for a specific query."""
-        mock_pins = {
-            'etsy jewelry': [
-                {
-                    'id': 'pin123456789',
-                    'title': 'Beautiful Handmade Jewelry from Etsy',
-                    'description': 'Stunning personalized name necklace found on Etsy. The craftsmanship is incredible!',
-                    'note': 'Love this handmade necklace! #Etsy #Handmade #Jewelry',
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'pinterest'
-                }
-            ],
-            'etsy home decor': [
-                {
-                    'id': 'pin987654321',
-                    'title': 'Etsy Home Decor Finds',
-                    'description': 'Amazing handmade home decor items from Etsy sellers. Everything is so unique!',
-                    'note': 'Perfect for my living room! #HomeDecor #Etsy #Handmade',
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'pinterest'
-                }
-            ],
-            'etsy gifts': [
-                {
-                    'id': 'pin555666777',
-                    'title': 'Wedding Gifts from Etsy',
-                    'description': 'Found the perfect personalized wedding gifts on Etsy. Handmade ceramic mugs with our initials.',
-                    'note': 'Love these personalized gifts! #Wedding #Etsy #Personalized',
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'pinterest'
-                }
-            ]
-        }
-        
-        return mock_pins.get(query, [])
+        collected_at = datetime.now().isoformat()
+        return [{**pin, 'collected_at': collected_at} for pin in _MOCK_QUERY_PINS.get(query, [])]
     
     def _get_mock_data(self) -> List[Dict[str, Any]]:
         """Return mock Pinterest data for testing."""
-        return [
-            {
-                'id': 'pin123456789',
-                'title': 'Beautiful Handmade Jewelry from Etsy',
-                'description': 'Stunning personalized name necklace found on Etsy. The craftsmanship is incredible and the seller was so helpful!',
-                'note': 'Love this handmade necklace! #Etsy #Handmade #Jewelry',
-                'collected_at': datetime.now().isoformat(),
-                'source': 'pinterest'
-            },
-            {
-                'id': 'pin987654321',
-                'title': 'Etsy Home Decor Finds',
-                'description': 'Amazing handmade home decor items from Etsy sellers. Everything is so unique and beautiful!',
-                'note': 'Perfect for my living room! #HomeDecor #Etsy #Handmade',
-                'collected_at': datetime.now().isoformat(),
-                'source': 'pinterest'
-            },
-            {
-                'id': 'pin555666777',
-                'title': 'Wedding Gifts from Etsy',
-                'description': 'Found the perfect personalized wedding gifts on Etsy. Handmade ceramic mugs with our initials.',
-                'note': 'Love these personalized gifts! #Wedding #Etsy #Personalized',
-                'collected_at': datetime.now().isoformat(),
-                'source': 'pinterest'
-            }
-        ] 
\ No newline at end of file
+        collected_at = datetime.now().isoformat()
+        return [{**pin, 'collected_at': collected_at} for pin in _MOCK_PINS] 
\ No newline at end of file
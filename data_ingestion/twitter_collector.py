@@ -5,6 +5,7 @@ Collects mentions and trending hashtags related to Etsy products from Twitter/X.
 """
 
 import asyncio
+import itertools
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
@@ -12,9 +13,81 @@ import aiohttp
 import os
 
 from utils.config import Config
+from ._keywords import ETSY_KEYWORD_RE
 
 logger = logging.getLogger(__name__)
 
+# Mock templates; collected_at is filled in per call
+_MOCK_QUERY_TWEETS = {
+    'etsy jewelry': [
+        {
+            'id': '1234567890123456789',
+            'text': 'Just received my personalized name necklace from Etsy! It\'s absolutely beautiful and the quality is amazing. Love supporting small businesses! #Etsy #Handmade #Jewelry',
+            'author_username': 'jewelry_lover',
+            'author_name': 'Sarah Johnson',
+            'retweet_count': 5,
+            'like_count': 23,
+            'reply_count': 3,
+            'quote_count': 1,
+            'collected_at': None,
+            'source': 'twitter'
+        }
+    ],
+    'etsy home decor': [
+        {
+            'id': '1234567890123456790',
+            'text': 'Found the perfect wedding gift on Etsy! Handmade ceramic mugs with our initials. The seller was so helpful and the packaging was beautiful. Highly recommend!',
+            'author_username': 'bride_to_be',
+            'author_name': 'Emily Davis',
+            'retweet_count': 12,
+            'like_count': 45,
+            'reply_count': 8,
+            'quote_count': 2,
+            'collected_at': None,
+            'source': 'twitter'
+        }
+    ]
+}
+
+_MOCK_TWEETS = [
+    {
+        'id': '1234567890123456789',
+        'text': 'Just received my personalized name necklace from Etsy! It\'s absolutely beautiful and the quality is amazing. Love supporting small businesses! #Etsy #Handmade #Jewelry',
+        'author_username': 'jewelry_lover',
+        'author_name': 'Sarah Johnson',
+        'retweet_count': 5,
+        'like_count': 23,
+        'reply_count': 3,
+        'quote_count': 1,
+        'collected_at': None,
+        'source': 'twitter'
+    },
+    {
+        'id': '1234567890123456790',
+        'text': 'Found the perfect wedding gift on Etsy! Handmade ceramic mugs with our initials. The seller was so helpful and the packaging was beautiful. Highly recommend!',
+        'author_username': 'bride_to_be',
+        'author_name': 'Emily Davis',
+        'retweet_count': 12,
+        'like_count': 45,
+        'reply_count': 8,
+        'quote_count': 2,
+        'collected_at': None,
+        'source': 'twitter'
+    },
+    {
+        'id': '1234567890123456791',
+        'text': 'Etsy haul! Got some amazing vintage jewelry and handmade soap. Everything is so unique and the sellers are incredibly talented. #Vintage #Handmade #Etsy',
+        'author_username': 'vintage_hunter',
+        'author_name': 'Mike Wilson',
+        'retweet_count': 8,
+        'like_count': 34,
+        'reply_count': 5,
+        'quote_count': 1,
+        'collected_at': None,
+        'source': 'twitter'
+    }
+]
+
 class TwitterCollector:
     """Collects Twitter/X mentions and discussions related to Etsy products."""
     
@@ -51,11 +124,21 @@ class TwitterCollector:
             
             max_tweets = config.get('max_tweets', 100)
             
-            all_tweets = []
+            max_concurrency = config.get('max_concurrency', 10)
+            
+            # Reuse the manager's pooled session when one has been provided
+            if self.session is not None:
+                results = await self._search_all_tweets(search_terms, max_tweets, max_concurrency)
+            else:
+                connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
+                async with aiohttp.ClientSession(connector=connector) as session:
+                    self.session = session
+                    try:
+                        results = await self._search_all_tweets(search_terms, max_tweets, max_concurrency)
+                    finally:
+                        self.session = None
             
-            for term in search_terms:
-                tweets = await self._search_tweets(term, max_tweets)
-                all_tweets.extend(tweets)
+            all_tweets = list(itertools.chain.from_iterable(results))
             
             # Remove duplicates and filter for relevance
             unique_tweets = self._deduplicate_tweets(all_tweets)
@@ -68,6 +151,17 @@ class TwitterCollector:
             logger.error(f"Error collecting Twitter data: {e}")
             return self._get_mock_data()
     
+    async def _search_all_tweets(self, search_terms: List[str], max_tweets: int,
+                                 max_concurrency: int) -> List[List[Dict[str, Any]]]:
+        """Search all terms concurrently, capped to stay under rate limits."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def search(term: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._search_tweets(term, max_tweets)
+        
+        return await asyncio.gather(*(search(term) for term in search_terms))
+    
     async def _search_tweets(self, query: str, max_tweets: int) -> List[Dict[str, Any]]:
         """Search for tweets using Twitter API v2."""
         try:
@@ -95,97 +189,23 @@ class TwitterCollector:
     
     def _filter_relevant_tweets(self, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter tweets for Etsy-related content."""
-        etsy_keywords = [
-            'etsy', 'handmade', 'personalized', 'custom', 'gift',
-            'jewelry', 'necklace', 'ring', 'bracelet', 'earrings',
-            'home decor', 'wall art', 'candle', 'mug', 't-shirt',
-            'wedding', 'vintage', 'craft', 'art', 'beauty',
-            'handcrafted', 'unique', 'artisan', 'small business'
-        ]
-        
         relevant_tweets = []
         
         for tweet in tweets:
             text_lower = tweet.get('text', '').lower()
             
             # Check if tweet contains Etsy-related keywords
-            if any(keyword in text_lower for keyword in etsy_keywords):
+            if ETSY_KEYWORD_RE.search(text_lower):
                 relevant_tweets.append(tweet)
         
         return relevant_tweets
     
     def _get_mock_tweets_for_query(self, query: str) -> List[Dict[str, Any]]:
         """Get mock tweets for a specific query."""
-        mock_tweets = {
-            'etsy jewelry': [
-                {
-                    'id': '1234567890123456789',
-                    'text': 'Just received my personalized name necklace from Etsy! It\'s absolutely beautiful and the quality is amazing. Love supporting small businesses! #Etsy #Handmade #Jewelry',
-                    'author_username': 'jewelry_lover',
-                    'author_name': 'Sarah Johnson',
-                    'retweet_count': 5,
-                    'like_count': 23,
-                    'reply_count': 3,
-                    'quote_count': 1,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'twitter'
-                }
-            ],
-            'etsy home decor': [
-                {
-                    'id': '1234567890123456790',
-                    'text': 'Found the perfect wedding gift on Etsy! Handmade ceramic mugs with our initials. The seller was so helpful and the packaging was beautiful. Highly recommend!',
-                    'author_username': 'bride_to_be',
-                    'author_name': 'Emily Davis',
-                    'retweet_count': 12,
-                    'like_count': 45,
-                    'reply_count': 8,
-                    'quote_count': 2,
-                    'collected_at': datetime.now().isoformat(),
-                    'source': 'twitter'
-                }
-            ]
-        }
-        
-        return mock_tweets.get(query, [])
+        collected_at = datetime.now().isoformat()
+        return [{**tweet, 'collected_at': collected_at} for tweet in _MOCK_QUERY_TWEETS.get(query, [])]
     
     def _get_mock_data(self) -> List[Dict[str, Any]]:
         """Return mock Twitter data for testing."""
-        return [
-            {
-                'id': '1234567890123456789',
-                'text': 'Just received my personalized name necklace from Etsy! It\'s absolutely beautiful and the quality is amazing. Love supporting small businesses! #Etsy #Handmade #Jewelry',
-                'author_username': 'jewelry_lover',
-                'author_name': 'Sarah Johnson',
-                'retweet_count': 5,
-                'like_count': 23,
-                'reply_count': 3,
-                'quote_count': 1,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'twitter'
-            },
-            {
-                'id': '1234567890123456790',
-                'text': 'Found the perfect wedding gift on Etsy! Handmade ceramic mugs with our initials. The seller was so helpful and the packaging was beautiful. Highly recommend!',
-                'author_username': 'bride_to_be',
-                'author_name': 'Emily Davis',
-                'retweet_count': 12,
-                'like_count': 45,
-                'reply_count': 8,
-                'quote_count': 2,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'twitter'
-            },
-            {
-                'id': '1234567890123456791',
-                'text': 'Etsy haul! Got some amazing vintage jewelry and handmade soap. Everything is so unique and the sellers are incredibly talented. #Vintage #Handmade #Etsy',
-                'author_username': 'vintage_hunter',
-                'author_name': 'Mike Wilson',
-                'retweet_count': 8,
-                'like_count': 34,
-                'reply_count': 5,
-                'quote_count': 1,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'twitter'
-            }
-        ] 
\ No newline at end of file
+        collected_at = datetime.now().isoformat()
+        return [{**tweet, 'collected_at': collected_at} for tweet in _MOCK_TWEETS] 
\ No newline at end of file
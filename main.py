@@ -99,14 +99,17 @@ class TrendDetectionSystem:
                 trends_data, historical_data
             )
             
+            # Build the keyword frame once for the aggregation passes below
+            trend_frame = self.emerging_detector.build_trend_frame(trends_data)
+            
             # Calculate multi-source confidence
             trends_with_confidence = self.emerging_detector.calculate_multi_source_confidence(
-                trends_data
+                trends_data, trend_frame=trend_frame
             )
             
             # Detect cross-platform trends
             cross_platform_trends = self.emerging_detector.detect_cross_platform_trends(
-                trends_with_confidence
+                trends_with_confidence, trend_frame=trend_frame
             )
             
             # Filter high-quality trends
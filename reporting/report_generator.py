@@ -536,7 +536,7 @@ class ReportGenerator:
         return {
             'fastest_growing': weekly_data[:5],
             'most_consistent': weekly_data[5:10],
-            'new_trends': [t for t in weekly_data if t.get('growth_rate', 0) == float('inf')]
+            'new_trends': [t for t in weekly_data if t.get('is_new', False)]
         }
         
     def _analyze_platform_performance(self, weekly_data: List[Dict[str, Any]]) -> Dict[str, Any]:
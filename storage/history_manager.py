@@ -43,6 +43,9 @@ class HistoryManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        # WAL lets the dashboard read while trends are being written
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Create trends table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS trends (
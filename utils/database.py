@@ -5,7 +5,7 @@ Database utility for storing and retrieving trend data.
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from pathlib import Path
 import json
 
@@ -13,6 +13,19 @@ from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Columns of the trends table that callers may project
+TREND_COLUMNS = frozenset({
+    'id', 'keyword', 'source', 'title', 'description', 'text_content',
+    'category', 'score', 'frequency', 'collected_at', 'created_at'
+})
+
+_INSERT_TREND_SQL = '''
+    INSERT INTO trends (
+        keyword, source, title, description, text_content,
+        category, score, frequency, collected_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 class Database:
     """SQLite database for storing trend data."""
     
@@ -67,37 +80,46 @@ class Database:
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
     
+    def _trend_row(self, data: Dict[str, Any]) -> tuple:
+        """Build the parameter tuple for inserting a trend record."""
+        return (
+            # Extract keyword from various fields
+            self._extract_keyword(data),
+            data.get('source', 'unknown'),
+            data.get('title', ''),
+            data.get('description', ''),
+            data.get('text', ''),
+            data.get('category', ''),
+            data.get('score', 0.0),
+            data.get('frequency', 1),
+            data.get('collected_at') or datetime.now().isoformat()
+        )
+    
     async def insert_trend_data(self, data: Dict[str, Any]):
         """Insert trend data into database."""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                
-                # Extract keyword from various fields
-                keyword = self._extract_keyword(data)
-                
-                cursor.execute('''
-                    INSERT INTO trends (
-                        keyword, source, title, description, text_content,
-                        category, score, frequency, collected_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    keyword,
-                    data.get('source', 'unknown'),
-                    data.get('title', ''),
-                    data.get('description', ''),
-                    data.get('text', ''),
-                    data.get('category', ''),
-                    data.get('score', 0.0),
-                    data.get('frequency', 1),
-                    data.get('collected_at', datetime.now().isoformat())
-                ))
-                
+                cursor.execute(_INSERT_TREND_SQL, self._trend_row(data))
                 conn.commit()
                 
         except Exception as e:
             logger.error(f"Error inserting trend data: {e}")
     
+    async def insert_trend_data_many(self, rows: Sequence[Dict[str, Any]]):
+        """Insert a batch of trend records in a single transaction."""
+        if not rows:
+            return
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_INSERT_TREND_SQL, [self._trend_row(data) for data in rows])
+                conn.commit()
+                
+        except Exception as e:
+            logger.error(f"Error inserting trend data batch: {e}")
+    
     def _extract_keyword(self, data: Dict[str, Any]) -> str:
         """Extract primary keyword from data."""
         # Try to extract keyword from various fields
@@ -113,16 +135,34 @@ class Database:
         
         return 'unknown'
     
-    async def get_recent_data(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get recent data from database."""
+    async def get_recent_data(self, hours: int = 24,
+                              columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent data from database.
+        
+        Args:
+            hours: How far back to look
+            columns: Columns to select; all columns when omitted
+        
+        Returns:
+            List of rows as dictionaries
+        """
         try:
+            if columns:
+                unknown = set(columns) - TREND_COLUMNS
+                if unknown:
+                    raise ValueError(f"Unknown trend columns: {sorted(unknown)}")
+                projection = ', '.join(columns)
+            else:
+                projection = '*'
+            
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cutoff_time = datetime.now() - timedelta(hours=hours)
                 
-                cursor.execute('''
-                    SELECT * FROM trends 
+                cursor.execute(f'''
+                    SELECT {projection} FROM trends 
                     WHERE collected_at >= ?
                     ORDER BY collected_at DESC
                 ''', (cutoff_time.isoformat(),))
@@ -130,15 +170,9 @@ class Database:
                 rows = cursor.fetchall()
                 
                 # Convert to list of dictionaries
-                columns = [description[0] for description in cursor.description]
-                data = []
-                
-                for row in rows:
-                    item = dict(zip(columns, row))
-                    data.append(item)
-                
-                return data
-                
+                names = [description[0] for description in cursor.description]
+                return [dict(zip(names, row)) for row in rows]
+        
         except Exception as e:
             logger.error(f"Error getting recent data: {e}")
             return []
@@ -0,0 +1,56 @@
+"""
+Fast JSON serialization helpers.
+
+Uses orjson when it is installed, then ujson, and finally the standard
+library json module, so callers get the fastest available backend.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+def dumps(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    
+    Args:
+        obj: Object to serialize; unsupported types are written as str()
+        indent: Pretty-print with two-space indentation
+        newline: Terminate the output with a newline
+    
+    Returns:
+        JSON document as bytes
+    """
+    if orjson:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option, default=str)
+    
+    if ujson:
+        text = ujson.dumps(obj, indent=2 if indent else 0, default=str, escape_forward_slashes=False)
+    else:
+        text = json.dumps(obj, indent=2 if indent else None, default=str)
+    
+    if newline:
+        text += '\n'
+    return text.encode('utf-8')
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    if ujson:
+        return ujson.loads(data)
+    return json.loads(data)